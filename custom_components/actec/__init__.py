@@ -1,20 +1,38 @@
 """Home Assistant integration for AcTEC devices."""
 
+from datetime import timedelta
 import logging
+import time
 
-from homeassistant.config_entries import ConfigEntry
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
 from homeassistant.const import CONF_HOST, CONF_MAC, CONF_TOKEN, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.exceptions import (
     ConfigEntryAuthFailed,
     ConfigEntryError,
     ConfigEntryNotReady,
+    HomeAssistantError,
+    ServiceValidationError,
 )
+from homeassistant.helpers import config_validation as cv, device_registry as dr
 from homeassistant.helpers.device_registry import DeviceEntry
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.helpers.typing import ConfigType
 
-from .config_flow import CONF_AREA_NAME_RULE
-from .const import DOMAIN
+from .config_flow import CONF_AREA_NAME_RULE, CONF_TOPOLOGY_REFRESH_INTERVAL
+from .const import DOMAIN, SIGNAL_UNITS_ADDED
+from .core.device import AcDevice
+from .core.exceptions import RequestRejected
 from .core.gateway import AcGateway
+from .core.group import AcGroup
+from .core.topology import AcTopologyDiff
+from .core.trace import TRACE_OUT
+from .core.types import FloorInfo
+from .entity import AcUnits
+from .store import AcTopologyStore, topology_hash
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +46,11 @@ PLATFORMS = [
     Platform.SWITCH,
 ]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+SERVICE_REFRESH_TOPOLOGY = "refresh_topology"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+
 type AcConfigEntry = ConfigEntry[AcGateway]
 
 
@@ -39,12 +62,48 @@ class AcConfigEntryError(ConfigEntryError):
         )
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+
+    async def refresh_topology(call: ServiceCall) -> None:
+        if entry_id := call.data.get(ATTR_CONFIG_ENTRY_ID):
+            entry = hass.config_entries.async_get_entry(entry_id)
+            if (
+                entry is None
+                or entry.domain != DOMAIN
+                or entry.state is not ConfigEntryState.LOADED
+            ):
+                raise ServiceValidationError(
+                    translation_domain=DOMAIN,
+                    translation_key="entry_not_loaded",
+                    translation_placeholders={"entry_id": entry_id},
+                )
+            entries = [entry]
+        else:
+            entries = [
+                entry
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            ]
+        for entry in entries:
+            await _async_refresh_topology(hass, entry)
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH_TOPOLOGY,
+        refresh_topology,
+        schema=vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string}),
+    )
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: AcConfigEntry) -> bool:
     """Set up AcTEC devices from a config entry."""
 
     _LOGGER.debug("async_setup_entry: %s", entry.entry_id)
     # _LOGGER.debug("entry.options: %s", entry.options)
 
+    start = time.monotonic()
     host = entry.data[CONF_HOST]
     mac = entry.data[CONF_MAC]
     token = entry.data[CONF_TOKEN]
@@ -53,6 +112,24 @@ async def async_setup_entry(hass: HomeAssistant, entry: AcConfigEntry) -> bool:
 
     entry.runtime_data = gateway
 
+    store = AcTopologyStore(hass, entry.entry_id)
+    if (cached := await store.async_load()) is not None:
+        # 用缓存的设备列表立即创建实体（不可用状态），连接网关放到后台
+        try:
+            gateway.init_devices(cached, area_name_rule)
+        except Exception:
+            _LOGGER.warning("设备列表缓存无效，重新从网关获取")
+            gateway = entry.runtime_data = AcGateway(host, mac, token)
+        else:
+            await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+            _LOGGER.info("已从缓存创建实体，耗时 %.2f 秒", time.monotonic() - start)
+            entry.async_create_background_task(
+                hass, _async_connect_cached(hass, entry, store), "connect"
+            )
+            entry.async_on_unload(entry.add_update_listener(entry_update_listener))
+            _schedule_topology_refresh(hass, entry)
+            return True
+
     try:
         await gateway.connect()
     except ConnectionError as e:
@@ -84,17 +161,158 @@ async def async_setup_entry(hass: HomeAssistant, entry: AcConfigEntry) -> bool:
         raise AcConfigEntryError("data_format_error") from e
 
     await gateway.ensure_alive()
+    await store.async_save(body["integrated_list"])
 
-    entry.async_create_background_task(hass, gateway.start_main_loop(), "main")
-    entry.async_create_background_task(hass, gateway.start_ping_loop(), "ping")
-
+    _start_background_tasks(hass, entry)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    _LOGGER.info("已从网关创建实体，耗时 %.2f 秒", time.monotonic() - start)
+
+    # 实体都已登记需要同步的属性，统一查询一次
+    entry.async_create_background_task(hass, gateway.start_sync(), "sync")
 
     entry.async_on_unload(entry.add_update_listener(entry_update_listener))
+    _schedule_topology_refresh(hass, entry)
+
+    return True
+
+
+def _start_background_tasks(hass: HomeAssistant, entry: AcConfigEntry) -> None:
+    gateway = entry.runtime_data
+    if _LOGGER.isEnabledFor(logging.DEBUG):
+        # 调试日志开启时才逐帧输出原始数据
+        entry.async_on_unload(gateway.trace.add_consumer(_log_frame))
+
+    entry.async_create_background_task(hass, gateway.start_main_loop(), "main")
+
+
+async def _async_connect_cached(
+    hass: HomeAssistant, entry: AcConfigEntry, store: AcTopologyStore
+) -> None:
+    """实体已从缓存创建，连接网关并核对设备列表."""
+    gateway = entry.runtime_data
+    try:
+        await gateway.connect_with_retry()
+    except Exception:
+        # 重试只处理网络错误，其它错误（如不支持的网关）不会自行恢复。
+        # 删除缓存后重新加载，由完整的启动流程报告设置失败
+        _LOGGER.exception("连接网关失败，重新加载")
+        await store.async_remove()
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return
+    # 先按缓存的设备列表开始工作，核对失败时实体也能正常控制和更新状态
+    _start_background_tasks(hass, entry)
+    try:
+        body = await gateway.fetch_topology()
+    except RequestRejected:
+        # 未同意授权，关闭连接使实体不可用
+        _LOGGER.error("网关拒绝获取设备列表，需要重新授权")
+        await gateway.close()
+        entry.async_start_reauth(hass)
+        return
+    except (TimeoutError, ConnectionError) as e:
+        _LOGGER.warning("获取设备列表失败，使用缓存的设备列表: %r", e)
+    else:
+        integrated_list: list[FloorInfo] | None = body.get("integrated_list")
+        if integrated_list is None:
+            _LOGGER.error("网关返回的设备列表格式错误: %s", body)
+            await gateway.close()
+            return
+        if store.hash != topology_hash(integrated_list):
+            # 设备列表有变化，增量更新实体
+            if not await _async_apply_topology(hass, entry, integrated_list):
+                return
+            await store.async_save(integrated_list)
+
+    await gateway.start_sync()
+
+
+def _schedule_topology_refresh(hass: HomeAssistant, entry: AcConfigEntry) -> None:
+    if not (hours := entry.options.get(CONF_TOPOLOGY_REFRESH_INTERVAL, 0)):
+        return
+
+    async def refresh(_now) -> None:
+        try:
+            await _async_refresh_topology(hass, entry)
+        except HomeAssistantError as e:
+            _LOGGER.warning("定时刷新设备列表失败: %s", e)
 
+    entry.async_on_unload(
+        async_track_time_interval(
+            hass, refresh, timedelta(hours=hours), name="actec topology refresh"
+        )
+    )
+
+
+async def _async_refresh_topology(hass: HomeAssistant, entry: AcConfigEntry) -> None:
+    """重新获取网关的设备列表并增量更新实体."""
+    gateway = entry.runtime_data
+    try:
+        body = await gateway.fetch_topology()
+    except Exception as e:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN, translation_key="refresh_failed"
+        ) from e
+    integrated_list: list[FloorInfo] | None = body.get("integrated_list")
+    if integrated_list is None:
+        raise HomeAssistantError(
+            translation_domain=DOMAIN, translation_key="data_format_error"
+        )
+    store = AcTopologyStore(hass, entry.entry_id)
+    await store.async_load()
+    if store.hash == topology_hash(integrated_list):
+        return
+    if await _async_apply_topology(hass, entry, integrated_list):
+        await store.async_save(integrated_list)
+
+
+async def _async_apply_topology(
+    hass: HomeAssistant, entry: AcConfigEntry, integrated_list: list[FloorInfo]
+) -> bool:
+    """按新的设备列表更新实体，需要重新加载时返回 False."""
+    diff: AcTopologyDiff = entry.runtime_data.reconcile(
+        integrated_list, entry.options[CONF_AREA_NAME_RULE]
+    )
+    if diff.replaced:
+        # 产品型号或群组类型改变，实体构成不同，只能重新加载
+        _LOGGER.info("设备型号已变化，重新加载: %s", diff)
+        await AcTopologyStore(hass, entry.entry_id).async_save(integrated_list)
+        hass.config_entries.async_schedule_reload(entry.entry_id)
+        return False
+
+    device_registry = dr.async_get(hass)
+    for unit in diff.removed:
+        # 删除设备会一并删除其实体
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, unit.unique_id)}
+        ):
+            device_registry.async_update_device(
+                device.id, remove_config_entry_id=entry.entry_id
+            )
+    for unit in diff.renamed:
+        # 场景改名由按钮实体自行更新
+        if isinstance(unit, AcDevice):
+            name = unit.device_name
+        elif isinstance(unit, AcGroup):
+            name = unit.group_name
+        else:
+            continue
+        if device := device_registry.async_get_device(
+            identifiers={(DOMAIN, unit.unique_id)}
+        ):
+            device_registry.async_update_device(device.id, name=name)
+    if diff.added:
+        async_dispatcher_send(
+            hass,
+            SIGNAL_UNITS_ADDED.format(entry.entry_id),
+            AcUnits.from_units(diff.added),
+        )
     return True
 
 
+def _log_frame(direction: str, raw: bytes) -> None:
+    _LOGGER.debug("%s %s", "=>" if direction == TRACE_OUT else "<=", raw)
+
+
 async def entry_update_listener(hass: HomeAssistant, entry: AcConfigEntry) -> None:
     """Handle updates to the config entry options."""
     # https://developers.home-assistant.io/docs/config_entries_options_flow_handler/#signal-updates
@@ -111,6 +329,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: AcConfigEntry) -> bool:
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: AcConfigEntry) -> None:
+    """Remove the topology cache along with the config entry."""
+    await AcTopologyStore(hass, entry.entry_id).async_remove()
+
+
 async def async_remove_config_entry_device(
     hass: HomeAssistant, config_entry: AcConfigEntry, device_entry: DeviceEntry
 ) -> bool:
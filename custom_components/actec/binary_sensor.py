@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from collections.abc import Callable
 from dataclasses import dataclass
 import logging
@@ -14,8 +16,7 @@ from homeassistant.helpers.restore_state import RestoreEntity
 
 from . import AcConfigEntry
 from .core.const import ACTION_SENSOR, KEY_PROPERTY, PROP_PIR_TRIGGER
-from .core.products import PRODUCTS_INFO
-from .entity import AcDeviceEntity, AcEntityDescription
+from .entity import AcDeviceEntity, AcEntityDescription, AcUnits, async_setup_units
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -47,25 +48,16 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC binary sensors."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
 
-    gateway = config_entry.runtime_data
-
-    entities: list[AcDeviceBinarySensor] = []
-
-    for device in gateway.devices.values():
-        if device.product_key in PRODUCTS_INFO:
-            entities.extend(
-                [
-                    AcDeviceBinarySensor(
-                        device, info["endpoint"], DESCRIPTIONS[info["type"]]
-                    )
-                    for info in PRODUCTS_INFO[device.product_key]
-                    if info["platform"] == Platform.BINARY_SENSOR
-                    and info["type"] in DESCRIPTIONS
-                ]
-            )
 
-    async_add_entities(entities)
+def _build_entities(units: AcUnits) -> list[AcDeviceBinarySensor]:
+    """Create binary sensor entities for the given units."""
+    return [
+        AcDeviceBinarySensor(device, endpoint, DESCRIPTIONS[type_])
+        for device, endpoint, type_ in units.device_capabilities(Platform.BINARY_SENSOR)
+        if type_ in DESCRIPTIONS
+    ]
 
 
 class AcDeviceBinarySensor(AcDeviceEntity, BinarySensorEntity, RestoreEntity):
@@ -81,7 +73,7 @@ class AcDeviceBinarySensor(AcDeviceEntity, BinarySensorEntity, RestoreEntity):
                 self._attr_is_on = True
             elif last_state.state == STATE_OFF:
                 self._attr_is_on = False
-        await self.device.fetch_property(self.endpoint, self.entity_description.action)
+        self.restore_property(self.entity_description.action)
 
     def update_state(self, body: dict) -> None:
         """Update state."""
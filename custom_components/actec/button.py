@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 import logging
 
@@ -10,7 +12,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import AcConfigEntry
 from .const import DOMAIN, MANUFACTURER
 from .core.scene import AcScene
-from .entity import AcEntityDescription
+from .entity import AcEntityDescription, AcUnits, async_setup_units
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -30,10 +32,12 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC buttons."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
+
 
-    gateway = config_entry.runtime_data
-    entities = [AcSceneButton(scene) for scene in gateway.scenes.values()]
-    async_add_entities(entities)
+def _build_entities(units: AcUnits) -> list[AcSceneButton]:
+    """Create scene buttons for the given units."""
+    return [AcSceneButton(scene) for scene in units.scenes]
 
 
 class AcSceneButton(ButtonEntity):
@@ -63,6 +67,14 @@ class AcSceneButton(ButtonEntity):
         await super().async_added_to_hass()
         self._attr_available = self.scene.gateway.available
         self.async_on_remove(self.scene.add_available_listener(self.set_available))
+        self.async_on_remove(self.scene.add_info_listener(self.update_info))
+
+    def update_info(self) -> None:
+        """Follow a scene rename from the app."""
+        self.entity_description = AcSceneButtonDescription(name=self.scene.scene_name)
+        # Entity.name is cached, only assigning _attr_name invalidates it
+        self._attr_name = self.scene.scene_name
+        self.async_write_ha_state()
 
     def set_available(self, available: bool) -> None:
         self._attr_available = available
@@ -26,6 +26,7 @@ else:
 _LOGGER = logging.getLogger(__name__)
 
 CONF_AREA_NAME_RULE = "area_name_rule"
+CONF_TOPOLOGY_REFRESH_INTERVAL = "topology_refresh_interval"  # 小时，0 表示不自动刷新
 
 
 class AcConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -54,6 +55,16 @@ class AcConfigFlow(ConfigFlow, domain=DOMAIN):
         self.mac = format_mac(properties["mac"])
 
         await self.async_set_unique_id(self.mac)
+        entry = self.hass.config_entries.async_entry_for_domain_unique_id(
+            DOMAIN, self.mac
+        )
+        if (
+            entry
+            and entry.data.get(CONF_HOST) == self.host
+            and (gateway := getattr(entry, "runtime_data", None))
+        ):
+            # 已配置的网关重新出现在网络上，地址没变时不会重新加载，直接触发重连
+            gateway.retry_now()
         self._abort_if_unique_id_configured(updates={CONF_HOST: self.host})
 
         self.context["title_placeholders"] = {
@@ -176,12 +187,22 @@ class OptionsFlowHandler(OptionsFlow):
                                 "floor": "楼层（1层）",
                             }
                         ),
+                        vol.Required(
+                            CONF_TOPOLOGY_REFRESH_INTERVAL,
+                            default=old_options.get(CONF_TOPOLOGY_REFRESH_INTERVAL, 0),
+                        ): vol.All(vol.Coerce(int), vol.Range(min=0, max=168)),
                     }
                 ),
             )
 
-        area_name_rule = user_input[CONF_AREA_NAME_RULE]
-        return self.async_create_entry(data={CONF_AREA_NAME_RULE: area_name_rule})
+        return self.async_create_entry(
+            data={
+                CONF_AREA_NAME_RULE: user_input[CONF_AREA_NAME_RULE],
+                CONF_TOPOLOGY_REFRESH_INTERVAL: user_input[
+                    CONF_TOPOLOGY_REFRESH_INTERVAL
+                ],
+            }
+        )
 
 
 async def _test_connect(host: str, token: str):
@@ -1,2 +1,5 @@
 DOMAIN = "actec"
 MANUFACTURER = "AcTEC"
+
+# 拓扑更新后新增的设备、场景、群组，参数为 AcUnits
+SIGNAL_UNITS_ADDED = f"{DOMAIN}_{{}}_units_added"
@@ -0,0 +1,46 @@
+"""设备按平台的功能索引."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import TYPE_CHECKING
+
+from .products import MODE_PRODUCTS_INFO, PRODUCTS_INFO
+from .types import ProductMode
+
+if TYPE_CHECKING:
+    from .device import AcDevice
+
+_LOGGER = logging.getLogger(__name__)
+
+Capability = tuple["AcDevice", int, str]  # (设备, endpoint, type)
+CapabilityIndex = dict[str, list[Capability]]  # platform => 该平台的全部功能
+
+
+def product_capabilities(
+    product_key: str, product_mode: ProductMode | None
+) -> list[dict] | None:
+    """产品的端点和功能列表，不支持的产品返回 None."""
+    if (product_key, product_mode) in MODE_PRODUCTS_INFO:
+        return MODE_PRODUCTS_INFO[product_key, product_mode]
+    return PRODUCTS_INFO.get(product_key)
+
+
+def build_capability_index(devices: Iterable[AcDevice]) -> CapabilityIndex:
+    """按平台汇总设备的功能.
+
+    每个设备只查一次产品表，各平台创建实体时只遍历自己的那一部分。
+    同一平台内按设备顺序、产品表中的端点顺序排列。
+    """
+    index: CapabilityIndex = {}
+    for device in devices:
+        infos = product_capabilities(device.product_key, device.product_mode)
+        if infos is None:
+            _LOGGER.debug("不支持的设备: %s", device)
+            continue
+        for info in infos:
+            index.setdefault(info["platform"], []).append(
+                (device, info["endpoint"], info["type"])
+            )
+    return index
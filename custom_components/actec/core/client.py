@@ -1,16 +1,35 @@
+from __future__ import annotations
+
 import asyncio
 from asyncio import StreamReader, StreamWriter
+from collections import deque
 from collections.abc import AsyncGenerator, Callable
-from datetime import datetime
 from enum import Enum
-import json
 import logging
+import random
+import time
 
+from .command import HA_REPORT, PING, AcCommandTemplate
 from .exceptions import NormallyClosed, UnsupportedGateway
+from .frame import AcFrameDecoder, encode_frame, frame_prefix
+from .scheduler import SEND_BURST, SEND_RATE, AcCommandScheduler, AcPriority
+from .trace import TRACE_IN, TRACE_OUT, AcFrameTrace
 from .utils import parse_host
+from .watchdog import DEAD_TIMEOUT, IDLE_TIMEOUT, PING_INTERVAL, AcLinkWatchdog
 
 _LOGGER = logging.getLogger(__name__)
 
+READ_CHUNK_SIZE = 65536
+MAX_BATCH_SIZE = 64
+LOGIN_PROMPT = b"login:"
+LOGIN_CHECK_DELAY = 0.5  # 发送密码后等待这么久，连接未被断开即认为密码正确
+
+# 重连退避：RECONNECT_BASE_DELAY * 2**n 秒，不超过 RECONNECT_MAX_DELAY，
+# 再随机缩短至多 RECONNECT_JITTER 比例，避免多个客户端同时重连
+RECONNECT_BASE_DELAY = 1.0
+RECONNECT_MAX_DELAY = 300.0
+RECONNECT_JITTER = 0.5
+
 
 class AcClientStatus(Enum):
     DISCONNECTED = 0
@@ -19,56 +38,248 @@ class AcClientStatus(Enum):
     CLOSED = 3  # 最终状态
 
 
+class AcTransportMode(Enum):
+    STREAM = "stream"  # StreamReader/StreamWriter
+    PROTOCOL = "protocol"  # asyncio.Protocol 回调
+
+
+class AcClientProtocol(asyncio.Protocol):
+    """基于 asyncio.Protocol 的传输层.
+
+    在 data_received 回调中直接解帧并交给 AcClient 分发，不为每帧创建协程。
+    同时提供与 StreamWriter 相同的写入接口，供 AcClient 统一使用。
+    """
+
+    def __init__(self, client: AcClient) -> None:
+        loop = asyncio.get_running_loop()
+        self._client = client
+        self._loop = loop
+        self._transport: asyncio.Transport | None = None
+        self._decoder = AcFrameDecoder(client.trace)
+        self._prompt = bytearray()
+        self._prompt_waiter: asyncio.Future[bytes] = loop.create_future()
+        self._closed: asyncio.Future[None] = loop.create_future()
+        self._drain_waiters: list[asyncio.Future[None]] = []
+        self.paused = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        if not self._prompt_waiter.done():
+            # 登录提示之前的数据
+            self._prompt += data
+            if len(self._prompt) < len(LOGIN_PROMPT):
+                return
+            data = bytes(self._prompt[len(LOGIN_PROMPT) :])
+            self._prompt_waiter.set_result(bytes(self._prompt[: len(LOGIN_PROMPT)]))
+            self._prompt.clear()
+            if not data:
+                return
+        try:
+            frames = self._decoder.feed(data)
+        except ConnectionError as e:
+            _LOGGER.error(e)
+            self._client.parse_errors += 1
+            self._transport.abort()
+            return
+        if frames:
+            self._client.on_frames(frames)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        error = ConnectionError("连接已被关闭")
+        if not self._prompt_waiter.done():
+            self._prompt_waiter.set_exception(error)
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_exception(error)
+        self._drain_waiters.clear()
+        if not self._closed.done():
+            self._closed.set_result(None)
+        self._client.on_connection_lost(self)
+
+    def pause_writing(self) -> None:
+        """发送缓冲区超过高水位."""
+        self.paused = True
+        _LOGGER.debug("发送缓冲区已满，暂停写入")
+
+    def resume_writing(self) -> None:
+        """发送缓冲区回落到低水位以下."""
+        self.paused = False
+        for waiter in self._drain_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+        self._drain_waiters.clear()
+        _LOGGER.debug("发送缓冲区恢复，继续写入")
+
+    async def read_login_prompt(self) -> bytes:
+        return await self._prompt_waiter
+
+    def write(self, data: bytes) -> None:
+        self._transport.write(data)
+
+    def writelines(self, data: list[bytes]) -> None:
+        self._transport.writelines(data)
+
+    async def drain(self) -> None:
+        if self._transport.is_closing():
+            raise ConnectionError("连接已被关闭")
+        if not self.paused:
+            return
+        waiter = self._loop.create_future()
+        self._drain_waiters.append(waiter)
+        await waiter
+
+    def is_closing(self) -> bool:
+        return self._transport is None or self._transport.is_closing()
+
+    def close(self) -> None:
+        if self._transport:
+            self._transport.close()
+
+    async def wait_closed(self) -> None:
+        await asyncio.shield(self._closed)
+
+
 class AcClient:
     def __init__(
         self,
         host: str,
         token: str,
         on_state_changed: Callable[[AcClientStatus], None],
+        transport_mode: AcTransportMode = AcTransportMode.STREAM,
+        *,
+        max_batch_size: int = MAX_BATCH_SIZE,
+        flush_latency: float = 0.0,
+        send_rate: float = SEND_RATE,
+        send_burst: int = SEND_BURST,
+        idle_timeout: float = IDLE_TIMEOUT,
+        ping_interval: float = PING_INTERVAL,
+        dead_timeout: float = DEAD_TIMEOUT,
     ) -> None:
         self.host, self.port = parse_host(host)
         self.token = token
+        self._prefix = frame_prefix(token)
+        self.transport_mode = transport_mode
+        self.max_batch_size = max_batch_size  # 单次写入的最大帧数
+        self.flush_latency = flush_latency  # 攒批等待秒数，0 表示只合并同一轮事件循环
         self.reader: StreamReader | None = None
-        self.writer: StreamWriter | None = None
+        self.writer: StreamWriter | AcClientProtocol | None = None
         self.status = AcClientStatus.DISCONNECTED
         self.on_state_changed = on_state_changed
+        self.on_response: Callable[[list[dict] | dict], None] | None = None
         self._retry_count = 0
-        self._last_received_time = datetime.now()
+        self._retry_now = asyncio.Event()
+        # 断线的 monotonic 时间，重连成功前有效
+        self.disconnected_at: float | None = None
+        self.reconnect_count = 0
+        self.last_reconnect_duration: float | None = None
+        self.max_reconnect_duration: float | None = None
+        self.parse_errors = 0  # 无法解析的数据块，每次都会断开重连
+        self.handler_errors = 0  # 消息处理函数抛出的异常
+        self.watchdog = AcLinkWatchdog(
+            self._send_ping,
+            self._on_link_dead,
+            idle_timeout=idle_timeout,
+            ping_interval=ping_interval,
+            dead_timeout=dead_timeout,
+        )
+        self.trace = AcFrameTrace()
+        self._decoder = AcFrameDecoder(self.trace)
+        self._frames: deque[list[dict] | dict] = deque()
+        self._frames_waiter: asyncio.Future[None] | None = None
+        self._closed = asyncio.Event()
+        self._reconnect_task: asyncio.Task | None = None
+        self.scheduler = AcCommandScheduler(send_rate, send_burst)
+        self._write_event = asyncio.Event()
+        self._writer_task: asyncio.Task | None = None
+
+    @property
+    def write_paused(self) -> bool:
+        """发送端是否处于背压状态（仅 PROTOCOL 模式）."""
+        return isinstance(self.writer, AcClientProtocol) and self.writer.paused
 
     async def connect(self) -> None:
         if self.reader or self.writer:
-            _LOGGER.warning("已经连接到网关 %s，不可重复连接。", self.host)
-            return
+            raise RuntimeError(f"已经连接到网关 {self.host}，不可重复连接")
 
-        self._last_received_time = datetime.now()
+        self._decoder.clear()
+        self._frames.clear()
 
         # 连接网关
         _LOGGER.debug("正在连接网关 %s", self.host)
-        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        try:
+            await self._login()
+        except BaseException:
+            # 网关接受连接后又断开（如正在启动）时丢弃这个连接，下次重试重新建立
+            self._drop_connection()
+            raise
 
-        # 接收“login:”提示
-        login_prompt = await self._read_exact(6)
-        if login_prompt != b"login:":
+        # 连接成功
+        if self.disconnected_at is not None:
+            self.reconnect_count += 1
+            self.last_reconnect_duration = time.monotonic() - self.disconnected_at
+            self.max_reconnect_duration = max(
+                self.max_reconnect_duration or 0.0, self.last_reconnect_duration
+            )
+        self.status = AcClientStatus.CONNECTED
+        self.watchdog.start()
+        self.on_state_changed(self.status)
+        self.disconnected_at = None
+        self._retry_count = 0
+
+    async def _login(self) -> None:
+        """建立连接并登录."""
+        if self.transport_mode == AcTransportMode.PROTOCOL:
+            _, protocol = await asyncio.get_running_loop().create_connection(
+                lambda: AcClientProtocol(self), self.host, self.port
+            )
+            self.writer = protocol
+            # 接收“login:”提示
+            login_prompt = await protocol.read_login_prompt()
+        else:
+            self.reader, self.writer = await asyncio.open_connection(
+                self.host, self.port
+            )
+            # 接收“login:”提示
+            login_prompt = await self._read_exact(len(LOGIN_PROMPT))
+        if login_prompt != LOGIN_PROMPT:
             raise UnsupportedGateway(f"错误的登录提示: {login_prompt.decode('utf-8')}")
 
         # 发送密码
         self.writer.write(b"ACTEC123\r\n")
         await self.writer.drain()
         # 检测连接，没被断开就说明密码正确。
-        await self.ensure_alive()
+        await asyncio.sleep(LOGIN_CHECK_DELAY)
+        if reason := self._link_closed():
+            # 由调用方按退避重试，不在连接过程中嵌套重连
+            raise ConnectionError(f"登录后连接被断开: {reason}")
 
-        # 连接成功
-        self.status = AcClientStatus.CONNECTED
-        self.on_state_changed(self.status)
-        self._retry_count = 0
-        self.__ping_error_printed = False
+    def _drop_connection(self) -> None:
+        """关闭未能完成登录的连接."""
+        if writer := self.writer:
+            self.writer = None
+            self.reader = None
+            writer.close()
 
     async def close(self, reconnect: bool = False) -> None:
+        self.watchdog.stop()
         try:
             self.status = (
                 AcClientStatus.RECONNECTING if reconnect else AcClientStatus.CLOSED
             )
             self.on_state_changed(self.status)
+            if reconnect:
+                self.disconnected_at = time.monotonic()
+            else:
+                self._closed.set()
+                task = self._reconnect_task
+                if task and task is not asyncio.current_task():
+                    task.cancel()
+                if task := self._writer_task:
+                    self._writer_task = None
+                    task.cancel()
+                self.scheduler.fail_all(ConnectionError("连接已关闭"))
             if writer := self.writer:
                 self.writer = None
                 self.reader = None
@@ -80,23 +291,101 @@ class AcClient:
 
     async def _reconnect(self) -> None:
         await self.close(True)
-        await asyncio.sleep(1)
+        self._retry_now.clear()
+        await self._backoff()
         while self.status != AcClientStatus.CONNECTED:
             try:
                 await self.connect()
-                _LOGGER.info("重连成功")
+                _LOGGER.info("重连成功，耗时 %.1f 秒", self.last_reconnect_duration)
             except Exception as e:
                 self._retry_count += 1
-                wait = 2**self._retry_count
-                _LOGGER.error("重连失败，%s秒后重试。%s", wait, e)
-                await asyncio.sleep(wait)
+                _LOGGER.error("重连失败（第 %s 次）: %s", self._retry_count, e)
+                await self._backoff()
+
+    async def connect_with_retry(self) -> None:
+        """首次连接，网络错误时按重连退避一直重试."""
+        while True:
+            try:
+                await self.connect()
+            except (OSError, ConnectionError) as e:
+                self._retry_count += 1
+                _LOGGER.warning("连接网关失败（第 %s 次）: %s", self._retry_count, e)
+                await self._backoff()
+            else:
+                return
+
+    async def _backoff(self) -> None:
+        """等待下一次重连，retry_now 会提前结束等待."""
+        delay = min(RECONNECT_MAX_DELAY, RECONNECT_BASE_DELAY * 2**self._retry_count)
+        delay *= 1 - random.random() * RECONNECT_JITTER
+        _LOGGER.debug("%.1f 秒后重连", delay)
+        try:
+            async with asyncio.timeout(delay):
+                await self._retry_now.wait()
+        except TimeoutError:
+            return
+        self._retry_now.clear()
+
+    def retry_now(self) -> None:
+        """网关重新出现（如 zeroconf 发现），立即重连并重置退避."""
+        if self.status in (AcClientStatus.DISCONNECTED, AcClientStatus.RECONNECTING):
+            _LOGGER.info("发现网关，立即重连")
+            self._retry_count = 0
+            self._retry_now.set()
+
+    async def serve(self, on_response: Callable[[list[dict] | dict], None]) -> None:
+        """持续接收响应并交给 on_response 处理，直到客户端关闭."""
+        if self.transport_mode == AcTransportMode.PROTOCOL:
+            # 帧在 data_received 回调中直接分发
+            self.on_response = on_response
+            try:
+                while self._frames:
+                    self._dispatch(on_response, self._frames.popleft())
+                await self._closed.wait()
+            finally:
+                self.on_response = None
+            raise NormallyClosed
+        async for response in self.take_response():
+            self._dispatch(on_response, response)
+
+    def _dispatch(
+        self, on_response: Callable[[list[dict] | dict], None], frame: list[dict] | dict
+    ) -> None:
+        """处理一帧，处理函数的异常只影响这一帧，不会结束接收."""
+        try:
+            on_response(frame)
+        except Exception:
+            self.handler_errors += 1
+            _LOGGER.exception("处理消息出错: %s", frame)
+
+    def on_frames(self, frames: list[list[dict] | dict]) -> None:
+        """PROTOCOL 模式下收到新帧."""
+        self.watchdog.feed()
+        if on_response := self.on_response:
+            for frame in frames:
+                self._dispatch(on_response, frame)
+            return
+        self._frames.extend(frames)
+        if (waiter := self._frames_waiter) and not waiter.done():
+            waiter.set_result(None)
+
+    def on_connection_lost(self, protocol: AcClientProtocol) -> None:
+        """PROTOCOL 模式下连接断开."""
+        if (waiter := self._frames_waiter) and not waiter.done():
+            waiter.set_exception(ConnectionError("连接已被关闭"))
+        if self.writer is not protocol or self.status != AcClientStatus.CONNECTED:
+            return
+        if self.on_response is not None:
+            _LOGGER.error("连接已被关闭")
+            self._reconnect_task = asyncio.get_running_loop().create_task(
+                self._reconnect()
+            )
 
     async def take_response(self) -> AsyncGenerator[list[dict] | dict]:
         """接收下一个响应，这里会处理重试逻辑，直到获得一个可用的包再返回给上层."""
         while True:
             try:
-                yield await self._take_response()
-                self._last_received_time = datetime.now()
+                responses = await self._take_responses()
             except ConnectionError as e:
                 if self.status == AcClientStatus.RECONNECTING:
                     # _LOGGER.debug("正在重连，%s", e)
@@ -106,59 +395,85 @@ class AcClient:
                     raise NormallyClosed from e
                 _LOGGER.error(e)
                 await self._reconnect()
+                continue
             except Exception:
                 await self.close()
                 raise
+            self.watchdog.feed()
+            for response in responses:
+                yield response
 
     async def _take_response(self) -> list[dict] | dict:
-        start_char = (await self._read_exact(1)).decode("utf-8")
-        if start_char != "[":
-            raise ConnectionError("Invalid start character")
+        """接收单个响应，同一次读取中多余的帧留给后续调用."""
+        if not self._frames:
+            self._frames.extend(await self._take_responses())
+        return self._frames.popleft()
 
-        vendor = (await self._read_exact(2)).decode("utf-8")
-        if vendor != "AT":
-            raise ConnectionError("Invalid vendor")
-
-        # noinspection PyUnusedLocal
-        (await self._read_exact(12)).decode("utf-8")
-        # _LOGGER.debug(mac)
-        length_str = (await self._read_exact(4)).decode("utf-8")
-        length = int(length_str, 16)
-        content = (await self._read_exact(length)).decode("utf-8")
-        end_char = (await self._read_exact(1)).decode("utf-8")
-
-        if end_char != "]":
-            raise ConnectionError("Invalid end character")
+    async def _take_responses(self) -> list[list[dict] | dict]:
+        """取出已缓冲的全部帧，没有时读取数据块直到至少解出一帧."""
+        if self.transport_mode == AcTransportMode.PROTOCOL:
+            while not self._frames:
+                if not self.writer or self.writer.is_closing():
+                    raise ConnectionError("尚未与网关建立连接")
+                self._frames_waiter = asyncio.get_running_loop().create_future()
+                try:
+                    await self._frames_waiter
+                finally:
+                    self._frames_waiter = None
+        if self._frames:
+            frames = list(self._frames)
+            self._frames.clear()
+            return frames
+        if not self.reader:
+            raise ConnectionError("尚未与网关建立连接")
+        while True:
+            packet = await self.reader.read(READ_CHUNK_SIZE)
+            if not packet:
+                raise ConnectionError("连接已被关闭")
+            try:
+                frames = self._decoder.feed(packet)
+            except ConnectionError:
+                self.parse_errors += 1
+                raise
+            if frames:
+                return frames
 
-        try:
-            return json.loads(content)
-        except json.JSONDecodeError as e:
-            raise ConnectionError("Invalid JSON content") from e
+    def stats(self) -> dict:
+        """协议层计数."""
+        trace = self.trace
+        return {
+            "status": self.status.name,
+            "frames_in": trace.frame_count[TRACE_IN],
+            "frames_out": trace.frame_count[TRACE_OUT],
+            "bytes_in": trace.byte_count[TRACE_IN],
+            "bytes_out": trace.byte_count[TRACE_OUT],
+            "parse_errors": self.parse_errors,
+            "handler_errors": self.handler_errors,
+            "reconnect_count": self.reconnect_count,
+            "last_reconnect_duration": self.last_reconnect_duration,
+            "max_reconnect_duration": self.max_reconnect_duration,
+            "queued_frames": len(self.scheduler),
+            "scheduler": self.scheduler.stats(),
+            "watchdog": self.watchdog.stats(),
+        }
 
-    __ping_error_printed = False
+    def _send_ping(self) -> None:
+        """链路空闲，发送心跳，不等待写入完成."""
+        if not self.writer:
+            return
+        future = self._queue_frame(
+            PING.encode(self._prefix), PING.head, AcPriority.BACKGROUND
+        )
+        future.add_done_callback(_consume_exception)
 
-    async def loop_ping(self):
-        while self.status != AcClientStatus.CLOSED:
-            try:
-                await asyncio.sleep(25)
-                await self.send_ping()
-            except Exception as e:
-                if self.__ping_error_printed:
-                    _LOGGER.error("PING ERROR: %s", e)
-                    self.__ping_error_printed = True
-
-    async def send_ping(self) -> None:
-        now = datetime.now()
-        if (now - self._last_received_time).total_seconds() > 85:
-            _LOGGER.error("长时间未收到网关数据，尝试重连")
-            await self._reconnect()
+    def _on_link_dead(self) -> None:
+        if self.status != AcClientStatus.CONNECTED:
             return
-        await self.send_command([{"namespace": "system", "command": "ping"}, {}])
+        _LOGGER.error("%.0f 秒未收到网关数据，尝试重连", self.watchdog.dead_timeout)
+        self._reconnect_task = asyncio.get_running_loop().create_task(self._reconnect())
 
     async def get_ha_report(self):
-        await self.send_command(
-            [{"namespace": "ha", "command": "get"}, {"action": "report"}]
-        )
+        await self.send_frame(HA_REPORT.encode(self._prefix), HA_REPORT.head)
         while True:
             response = await self._take_response()
             # {'namespace': 'ha', 'response': 'get', 'success': False, 'type': 'none'}
@@ -172,20 +487,77 @@ class AcClient:
             else:
                 _LOGGER.debug("DROP: <= %s", response)
 
-    async def send_command(self, data: list[dict]) -> None:
+    def encode_command(self, data: list[dict]) -> bytes:
+        """按通用方式编码一帧."""
+        return encode_frame(self._prefix, data)
+
+    def encode_template(self, template: AcCommandTemplate, *args: object) -> bytes:
+        """编码一条固定结构的命令."""
+        return template.encode(self._prefix, *args)
+
+    async def send_command(
+        self, data: list[dict], priority: AcPriority = AcPriority.INTERACTIVE
+    ) -> None:
+        """发送命令，数据写入并 drain 完成后返回."""
+        await self.send_frame(self.encode_command(data), data[0], priority)
+
+    async def send_frame(
+        self,
+        message: bytes,
+        head: dict,
+        priority: AcPriority = AcPriority.INTERACTIVE,
+    ) -> None:
+        """按优先级排队发送已编码的帧，head 仅用于追踪."""
         if not self.writer:
             raise ConnectionError("尚未与网关建立连接")
+        await self._queue_frame(message, head, priority)
 
-        content: str = json.dumps(data, separators=(",", ":"))  # 转为 JSON 格式
-        message: bytes = f"[AT{self.token}{len(content):04X}{content}]".encode()
-        try:
-            # _LOGGER.debug("=> %s", content)
-            _LOGGER.debug("=> %s", message)
-            self.writer.write(message)
-            await self.writer.drain()
-        except Exception as e:
-            _LOGGER.error("[发送失败] %s", e)
-            raise
+    def _queue_frame(
+        self, message: bytes, head: dict, priority: AcPriority
+    ) -> asyncio.Future[None]:
+        """帧进入发送队列，返回写入完成时结束的 future."""
+        self.trace.record(TRACE_OUT, len(message), head)
+        if self.trace.has_consumers:
+            self.trace.emit(TRACE_OUT, message)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.scheduler.put(priority, message, future)
+        self._write_event.set()
+        if not self._writer_task:
+            self._writer_task = loop.create_task(self._write_loop())
+        return future
+
+    async def _write_loop(self) -> None:
+        """唯一的写入任务：按优先级合并排队的帧，一次 writelines 后只 drain 一次."""
+        scheduler = self.scheduler
+        while True:
+            await self._write_event.wait()
+            if self.flush_latency > 0:
+                await asyncio.sleep(self.flush_latency)
+            self._write_event.clear()
+            while scheduler:
+                if delay := scheduler.delay():
+                    # 令牌用尽，等待期间新到的高优先级帧仍会排在前面
+                    await asyncio.sleep(delay)
+                    continue
+                batch = scheduler.take(self.max_batch_size)
+                try:
+                    await self._flush([message for message, _ in batch])
+                except Exception as e:
+                    _LOGGER.error("[发送失败] %s", e)
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_exception(e)
+                else:
+                    for _, future in batch:
+                        if not future.done():
+                            future.set_result(None)
+
+    async def _flush(self, messages: list[bytes]) -> None:
+        if not (writer := self.writer):
+            raise ConnectionError("尚未与网关建立连接")
+        writer.writelines(messages)
+        await writer.drain()
 
     async def _read_exact(self, length: int) -> bytes:
         """从流中精确读取指定长度的数据."""
@@ -199,16 +571,27 @@ class AcClient:
             data += packet
         return data
 
+    def _link_closed(self) -> str | None:
+        """连接已断开时返回原因."""
+        if not self.writer or (
+            self.transport_mode == AcTransportMode.STREAM and not self.reader
+        ):
+            return "no writer or no reader"
+        if self.writer.is_closing():
+            return "writer is closing"
+        if self.reader and self.reader.at_eof():
+            return "reader at eof"
+        return None
+
     async def ensure_alive(self):
-        await asyncio.sleep(0.5)
-        if not self.writer or not self.reader:
-            _LOGGER.debug("ensure_alive, no writer or no reader")
-            await self._reconnect()
-        elif self.writer.is_closing():
-            _LOGGER.debug("ensure_alive, writer is closing")
-            await self._reconnect()
-        elif self.reader.at_eof():
-            _LOGGER.debug("ensure_alive, reader at eof")
+        await asyncio.sleep(LOGIN_CHECK_DELAY)
+        if reason := self._link_closed():
+            _LOGGER.debug("ensure_alive, %s", reason)
             await self._reconnect()
         else:
             _LOGGER.debug("ensure_alive.")
+
+
+def _consume_exception(future: asyncio.Future[None]) -> None:
+    if not future.cancelled():
+        future.exception()
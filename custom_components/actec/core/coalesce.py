@@ -0,0 +1,87 @@
+"""连续设置命令的合并."""
+
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+from .exceptions import CommandDropped
+
+COALESCE_WINDOW = 0.1  # 同一目标两次发送之间的最小间隔（秒）
+
+SendFunc = Callable[[], Awaitable[dict]]
+
+
+class _Slot:
+    """一个目标上等待发送的最新命令及其调用者."""
+
+    def __init__(self, send: SendFunc, waiter: asyncio.Future[dict]) -> None:
+        self.send: SendFunc | None = send
+        self.waiters = [waiter]
+        self.task: asyncio.Task | None = None
+
+
+class AcCommandCoalescer:
+    """按目标合并设置命令，只保留最新的值（后写者胜）.
+
+    拖动亮度、色盘或窗帘位置滑块时会连续下发大量设置。同一目标（设备端点 + action
+    或群组 + action）空闲时第一条立即发送；发送中（等待网关应答及其后的 window）
+    到达的命令只保留最新一条，前一条发送完成后再发出，因此最终值一定会发送。
+    被覆盖的调用与覆盖它的命令一起返回，被丢弃的调用抛出 CommandDropped。
+    """
+
+    def __init__(self, window: float = COALESCE_WINDOW) -> None:
+        self.window = window
+        self.superseded = 0  # 被更新的值覆盖、没有发送的命令数
+        self._slots: dict[Hashable, _Slot] = {}
+
+    async def submit(self, key: Hashable, send: SendFunc) -> dict:
+        """提交一条命令，在它（或覆盖它的命令）得到应答后返回."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        if (slot := self._slots.get(key)) is None:
+            slot = self._slots[key] = _Slot(send, future)
+            slot.task = loop.create_task(self._run(key, slot))
+        else:
+            if slot.send is not None:
+                self.superseded += 1
+            slot.send = send
+            slot.waiters.append(future)
+        return await future
+
+    def drop(self, key: Hashable) -> None:
+        """丢弃目标上尚未发送的命令（如关灯后不应再补发亮度），其调用者抛出 CommandDropped."""
+        if (slot := self._slots.get(key)) is None or slot.send is None:
+            return
+        slot.send = None
+        for waiter in slot.waiters:
+            if not waiter.done():
+                waiter.set_exception(CommandDropped(f"命令已被丢弃: {key}"))
+        slot.waiters = []
+
+    async def _run(self, key: Hashable, slot: _Slot) -> None:
+        waiters: list[asyncio.Future[dict]] = []
+        try:
+            while (send := slot.send) is not None:
+                waiters = slot.waiters
+                slot.send = None
+                slot.waiters = []
+                try:
+                    result = await send()
+                except Exception as e:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_exception(e)
+                else:
+                    for waiter in waiters:
+                        if not waiter.done():
+                            waiter.set_result(result)
+                await asyncio.sleep(self.window)
+        finally:
+            del self._slots[key]
+            # 发送被取消（如卸载集成）时，正在发送和排队的调用者也随之取消，不会一直等待
+            for waiter in (*waiters, *slot.waiters):
+                if not waiter.done():
+                    waiter.cancel()
+
+    def __len__(self) -> int:
+        """正在发送或等待发送的目标数量."""
+        return len(self._slots)
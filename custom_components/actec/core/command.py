@@ -0,0 +1,138 @@
+"""出站命令的编码.
+
+所有出站命令都由 AcCommandTemplate.encode 编码，结果与 encode_frame 逐字节一致。
+命令的结构是固定的：使用标准库 json 时，按属性的键预先把固定部分序列化好，
+发送时只编码可变字段并拼接；orjson 编码整个命令比拼接更快（约 1.0 µs 对 1.4 µs），
+这时直接交给 encode_frame。
+"""
+
+from collections.abc import Callable
+
+from .frame import JSON_BACKEND, encode_frame, json_dumps
+
+# 只有标准库 json 时预编译更快
+PRECOMPILED = JSON_BACKEND == "json"
+
+_MARKER = "\ufffeactec-field-%d\ufffe"
+
+# 每个命令按属性的键预编译，形状取决于协议，数量有限
+_FORMAT_CACHE_SIZE = 64
+
+# 设备 ID、action 等字符串取值有限，缓存其编码结果
+_STR_CACHE_SIZE = 4096
+_str_cache: dict[str, bytes] = {}
+
+Shape = tuple[tuple[str, ...] | None, ...]
+
+
+def _encode_value(value: object) -> bytes:
+    kind = type(value)
+    if kind is int:
+        return b"%d" % value
+    if kind is str:
+        if (encoded := _str_cache.get(value)) is None:
+            encoded = json_dumps(value)
+            if len(_str_cache) < _STR_CACHE_SIZE:
+                _str_cache[value] = encoded
+        return encoded
+    return json_dumps(value)
+
+
+class AcCommandTemplate:
+    """一种固定结构的命令.
+
+    build 接收命令的参数，返回 body。dict 参数（属性）按键的顺序展开为多个字段，
+    字段在 body 中的顺序须与参数顺序一致，否则该形状不预编译。
+    """
+
+    __slots__ = ("_build", "_formats", "head")
+
+    def __init__(self, head: dict, build: Callable[..., dict]) -> None:
+        self.head = head
+        self._build = build
+        # 参数形状 => 格式串，None 表示无法预编译
+        self._formats: dict[Shape, bytes | None] = {}
+
+    def encode(self, prefix: bytes, *args: object) -> bytes:
+        """返回完整的帧.
+
+        prefix: frame_prefix 的结果
+        """
+        if not PRECOMPILED:
+            return encode_frame(prefix, [self.head, self._build(*args)])
+        shape = tuple([tuple(arg) if type(arg) is dict else None for arg in args])
+        if shape in self._formats:
+            fmt = self._formats[shape]
+        else:
+            fmt = self._compile(shape)
+        if fmt is None:
+            return encode_frame(prefix, [self.head, self._build(*args)])
+        values = []
+        for arg in args:
+            if type(arg) is dict:
+                values.extend([_encode_value(value) for value in arg.values()])
+            else:
+                values.append(_encode_value(arg))
+        content = fmt % tuple(values)
+        return b"%s%04X%s]" % (prefix, len(content), content)
+
+    def _compile(self, shape: Shape) -> bytes | None:
+        markers: list[str] = []
+
+        def marker() -> str:
+            markers.append(_MARKER % len(markers))
+            return markers[-1]
+
+        placeholders = [
+            marker() if keys is None else {key: marker() for key in keys}
+            for keys in shape
+        ]
+        raw = json_dumps([self.head, self._build(*placeholders)])
+        parts: list[bytes] = []
+        fmt: bytes | None = None
+        for encoded in map(json_dumps, markers):
+            before, found, raw = raw.partition(encoded)
+            if not found or encoded in raw:
+                break
+            parts.append(before)
+        else:
+            parts.append(raw)
+            fmt = b"%s".join(part.replace(b"%", b"%%") for part in parts)
+        if len(self._formats) < _FORMAT_CACHE_SIZE:
+            self._formats[shape] = fmt
+        return fmt
+
+
+PING = AcCommandTemplate({"namespace": "system", "command": "ping"}, dict)
+HA_REPORT = AcCommandTemplate(
+    {"namespace": "ha", "command": "get"}, lambda: {"action": "report"}
+)
+DEVICE_GET = AcCommandTemplate(
+    {"namespace": "device_control", "command": "get"},
+    lambda device_id, endpoint, action: {
+        "device_id": device_id,
+        "endpoint": endpoint,
+        "action": action,
+    },
+)
+DEVICE_SET = AcCommandTemplate(
+    {"namespace": "device_control", "command": "set"},
+    lambda device_id, endpoint, action, data: {
+        "device_id": device_id,
+        "endpoint": endpoint,
+        "action": action,
+        "property": data,
+    },
+)
+SCENE_TRIGGER = AcCommandTemplate(
+    {"namespace": "scene_control", "command": "trigger"},
+    lambda scene_id: {"scene_id": scene_id},
+)
+GROUP_SET = AcCommandTemplate(
+    {"namespace": "group_control", "command": "set"},
+    lambda group_id, action, data: {
+        "group_id": group_id,
+        "action": action,
+        "property": data,
+    },
+)
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 from collections.abc import Callable
-from functools import cached_property
 import logging
+import sys
+import time
 from typing import TYPE_CHECKING
 
 from .const import (
     ACTION_CW,
     ACTION_HSV,
+    ACTION_KEY,
     ACTION_LEVEL,
     ACTION_ONOFF,
     ACTION_POSITION,
+    KEY_ACTION,
     KEY_ENDPOINT,
     KEY_PROPERTY,
     PROP_CW,
@@ -32,26 +35,46 @@ _LOGGER = logging.getLogger(__name__)
 
 
 class AcDevice(AcBaseUnit):
+    __slots__ = (
+        "_properties",
+        "_unconfirmed",
+        "device_id",
+        "device_name",
+        "product_key",
+        "product_mode",
+    )
+
     def __init__(
         self, gateway: AcGateway, info: DeviceInfo, suggested_area: str | None
     ) -> None:
         super().__init__(gateway, suggested_area)
-        self.product_key: str = info["product_key"]
+        self.product_key: str = sys.intern(info["product_key"])
         self.product_mode: ProductMode | None = info.get("product_mode")
         self.device_id: str = info["device_id"]
         self.device_name: str = info["name"]
-        self._state_callbacks: dict[int, set[Callable[[dict], None]]] = {}
+        # (endpoint, action) => (最近一次上报的 body, 上报时间 monotonic)
+        self._properties: dict[tuple[int, str], tuple[dict, float]] = {}
+        # 已下发设置、等待网关上报确认的 (endpoint, action)，其上报不做去重；
+        # 大多数设备从不被控制，第一次设置时才创建
+        self._unconfirmed: set[tuple[int, str]] | None = None
 
-    @cached_property
+    @property
     def unique_id(self) -> str:
-        return f"{self.device_id}"
+        return self.device_id
+
+    @property
+    def listener_count(self) -> int:
+        """已注册的状态监听者数量."""
+        return sum(
+            len(callbacks)
+            for key, callbacks in self._listeners.items()
+            if isinstance(key, int)
+        )
 
     def add_listener(
         self, endpoint: int, update_callback: Callable[[dict], None]
     ) -> Callable[[], None]:
-        callbacks = self._state_callbacks.setdefault(endpoint, set())
-        callbacks.add(update_callback)
-        return lambda: callbacks.discard(update_callback)
+        return self.add_listener_for(endpoint, update_callback)
 
     def update_property(self, body: dict) -> None:
         """Update property of the device.
@@ -63,25 +86,84 @@ class AcDevice(AcBaseUnit):
             property: ActionProperty[A]
         """
         endpoint = body.get(KEY_ENDPOINT)
+        action = body.get(KEY_ACTION)
         prop = body.get(KEY_PROPERTY)
-        _LOGGER.debug("设备属性上报: %s#%s %s", self.device_id, endpoint, prop)
-        if callbacks := self._state_callbacks.get(endpoint):
-            for callback in callbacks:
-                callback(body)
-
-    async def fetch_property(self, endpoint: int, action: str) -> None:
-        """Fetch property of the device.
+        key = (endpoint, action)
+        previous = self._properties.get(key)
+        self._properties[key] = (body, time.monotonic())
+        if (unconfirmed := self._unconfirmed) and key in unconfirmed:
+            unconfirmed.discard(key)
+        elif (
+            previous is not None
+            and action != ACTION_KEY  # 按键事件每次都要触发
+            and previous[0].get(KEY_PROPERTY) == prop
+        ):
+            # 与上次上报相同，不再通知实体
+            self.gateway.reports_suppressed += 1
+            return
+        self.gateway.reports_forwarded += 1
+        for callback in self._listeners.get(endpoint, ()):
+            callback(body)
+
+    def get_cached(self, endpoint: int, action: str) -> dict | None:
+        """Return the last reported body for the endpoint and action.
 
         Args:
             endpoint (int): Endpoint of the device
             action (str): Action of the device
         Returns:
-            dict: Property of the device
+            dict | None: Last reported body, None if nothing was reported yet
+
+        """
+        if cached := self._properties.get((endpoint, action)):
+            return cached[0]
+        return None
+
+    def get_cached_time(self, endpoint: int, action: str) -> float | None:
+        """Return the monotonic time of the last report, None if never reported."""
+        if cached := self._properties.get((endpoint, action)):
+            return cached[1]
+        return None
+
+    def poll_property(self, endpoint: int, action: str) -> Callable[[], None]:
+        """Poll the property periodically, return a function that stops polling.
+
+        Args:
+            endpoint (int): Endpoint of the device
+            action (str): Action of the device
+
+        """
+        return self.gateway.poller.register(self.device_id, endpoint, action)
+
+    def sync_property(self, endpoint: int, action: str) -> None:
+        """Queue the property for the gateway's sync phase.
+
+        Args:
+            endpoint (int): Endpoint of the device
+            action (str): Action of the device
 
         """
-        await self.gateway.get_device_property(self.device_id, endpoint, action)
-        # _LOGGER.debug("fetch_property: %s", result)
-        # return result
+        self.gateway.queue_sync(self.device_id, endpoint, action)
+
+    async def _set_property(self, endpoint: int, action: str, data: dict) -> dict:
+        if self._unconfirmed is None:
+            self._unconfirmed = set()
+        self._unconfirmed.add((endpoint, action))
+        return await self.gateway.set_device_property(
+            self.device_id, endpoint, action, data
+        )
+
+    async def _set_property_latest(
+        self, endpoint: int, action: str, data: dict
+    ) -> None:
+        """连续设置时只发送最新的值，见 AcCommandCoalescer.
+
+        等待发送时被关灯丢弃则抛出 CommandDropped。
+        """
+        await self.gateway.coalescer.submit(
+            (self.device_id, endpoint, action),
+            lambda: self._set_property(endpoint, action, data),
+        )
 
     async def set_onoff(self, endpoint: int, on: bool) -> None:
         """Turn on/off the device.
@@ -91,9 +173,10 @@ class AcDevice(AcBaseUnit):
             on (bool): True for on, False for off
 
         """
-        await self.gateway.set_device_property(
-            self.device_id, endpoint, ACTION_ONOFF, {PROP_ONOFF: 1 if on else 0}
-        )
+        if not on:
+            for action in (ACTION_LEVEL, ACTION_CW, ACTION_HSV):
+                self.gateway.coalescer.drop((self.device_id, endpoint, action))
+        await self._set_property(endpoint, ACTION_ONOFF, {PROP_ONOFF: 1 if on else 0})
 
     async def set_brightness(self, endpoint: int, brightness: float) -> None:
         """Set brightness of the light.
@@ -103,8 +186,8 @@ class AcDevice(AcBaseUnit):
             brightness (float): 0.0-100.0
 
         """
-        await self.gateway.set_device_property(
-            self.device_id, endpoint, ACTION_LEVEL, {PROP_LEVEL: brightness}
+        await self._set_property_latest(
+            endpoint, ACTION_LEVEL, {PROP_LEVEL: brightness}
         )
 
     async def set_color_temp(self, endpoint: int, color_temp: int) -> None:
@@ -115,9 +198,7 @@ class AcDevice(AcBaseUnit):
             color_temp (int): 2700-6500
 
         """
-        await self.gateway.set_device_property(
-            self.device_id, endpoint, ACTION_CW, {PROP_CW: color_temp}
-        )
+        await self._set_property_latest(endpoint, ACTION_CW, {PROP_CW: color_temp})
 
     async def set_hsv(
         self, endpoint: int, hue: int, saturation: int, value: int
@@ -131,11 +212,8 @@ class AcDevice(AcBaseUnit):
             value (float): 0-1000
 
         """
-        await self.gateway.set_device_property(
-            self.device_id,
-            endpoint,
-            ACTION_HSV,
-            {PROP_H: hue, PROP_S: saturation, PROP_V: value},
+        await self._set_property_latest(
+            endpoint, ACTION_HSV, {PROP_H: hue, PROP_S: saturation, PROP_V: value}
         )
 
     async def set_position(self, endpoint: int, position: int) -> None:
@@ -146,8 +224,8 @@ class AcDevice(AcBaseUnit):
             position (int): 0-100
 
         """
-        await self.gateway.set_device_property(
-            self.device_id, endpoint, ACTION_POSITION, {PROP_POSITION: position}
+        await self._set_property_latest(
+            endpoint, ACTION_POSITION, {PROP_POSITION: position}
         )
 
     def __repr__(self) -> str:
@@ -7,3 +7,15 @@ class NormallyClosed(Exception):
 
 class UnsupportedGateway(Exception):
     """不支持的网关设备."""
+
+
+class RequestRejected(Exception):
+    """网关拒绝了请求（响应头中 success 为 false）."""
+
+    def __init__(self, head: dict) -> None:
+        super().__init__(f"网关拒绝了请求: {head}")
+        self.head = head
+
+
+class CommandDropped(Exception):
+    """等待发送的设置命令被丢弃，没有发送给网关."""
@@ -0,0 +1,101 @@
+"""AcTEC 协议帧编解码.
+
+帧格式: [AT<mac:12><len:4 hex><json>]
+"""
+
+from collections.abc import Callable
+import json
+
+from .trace import TRACE_IN, AcFrameTrace
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+FRAME_START = 0x5B  # "["
+FRAME_END = 0x5D  # "]"
+FRAME_VENDOR = b"AT"
+FRAME_HEADER_SIZE = 19  # "[" + "AT" + mac(12) + len(4)
+
+# JSON 编解码：优先使用 orjson（Home Assistant 自带），否则退回标准库。
+# 两者都直接处理 bytes，不经过中间的 str。
+json_loads: Callable[[bytes | bytearray | memoryview], object]
+json_dumps: Callable[[object], bytes]
+if orjson is not None:
+    JSON_BACKEND = "orjson"
+    json_loads = orjson.loads  # 可直接解析 memoryview，无需复制
+    json_dumps = orjson.dumps
+else:
+    JSON_BACKEND = "json"
+
+    def json_loads(data: bytes | bytearray | memoryview) -> object:
+        """用标准库解析 JSON bytes."""
+        return json.loads(bytes(data))
+
+    def json_dumps(obj: object) -> bytes:
+        """用标准库序列化为紧凑的 JSON bytes."""
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+
+class AcFrameDecoder:
+    """与 IO 无关的帧解码器.
+
+    每次 feed 追加数据到复用的缓冲区，并一次性取出其中所有完整的帧。
+    """
+
+    def __init__(self, trace: AcFrameTrace | None = None) -> None:
+        self._buffer = bytearray()
+        self._trace = trace
+
+    def feed(self, data: bytes) -> list[list[dict] | dict]:
+        """追加数据，返回所有已完整接收的帧."""
+        buffer = self._buffer
+        trace = self._trace
+        buffer += data
+        frames: list[list[dict] | dict] = []
+        offset = 0
+        size = len(buffer)
+        with memoryview(buffer) as view:
+            while size - offset >= FRAME_HEADER_SIZE:
+                if buffer[offset] != FRAME_START:
+                    raise ConnectionError("Invalid start character")
+                if view[offset + 1 : offset + 3] != FRAME_VENDOR:
+                    raise ConnectionError("Invalid vendor")
+                try:
+                    length = int(buffer[offset + 15 : offset + 19], 16)
+                except ValueError as e:
+                    raise ConnectionError("Invalid length") from e
+                end = offset + FRAME_HEADER_SIZE + length
+                if end >= size:
+                    break  # 帧不完整，等待更多数据
+                if buffer[end] != FRAME_END:
+                    raise ConnectionError("Invalid end character")
+                try:
+                    frame = json_loads(view[offset + FRAME_HEADER_SIZE : end])
+                except ValueError as e:
+                    raise ConnectionError("Invalid JSON content") from e
+                frames.append(frame)
+                if trace is not None:
+                    trace.record(TRACE_IN, end + 1 - offset, frame)
+                    if trace.has_consumers:
+                        trace.emit(TRACE_IN, bytes(view[offset : end + 1]))
+                offset = end + 1
+        if offset:
+            del buffer[:offset]
+        return frames
+
+    def clear(self) -> None:
+        """丢弃缓冲区中的残留数据."""
+        self._buffer.clear()
+
+
+def frame_prefix(token: str) -> bytes:
+    """帧头中固定不变的部分 "[AT<token>"."""
+    return b"[AT" + token.encode()
+
+
+def encode_frame(prefix: bytes, data: list[dict]) -> bytes:
+    """编码一帧要发送的数据."""
+    content = json_dumps(data)
+    return b"%s%04X%s]" % (prefix, len(content), content)
@@ -1,27 +1,120 @@
-from asyncio import Future
+import asyncio
+from collections.abc import Callable
+from functools import cached_property
 import logging
+import time
+from typing import Any
 
-from .client import AcClient, AcClientStatus
+from .capabilities import CapabilityIndex, build_capability_index
+from .client import AcClient, AcClientStatus, AcTransportMode
+from .coalesce import AcCommandCoalescer
+from .command import DEVICE_GET, DEVICE_SET, GROUP_SET, HA_REPORT, SCENE_TRIGGER
+from .const import ACTION_CW, ACTION_HSV, ACTION_LEVEL, ACTION_ONOFF, ACTION_POSITION
 from .device import AcDevice
-from .exceptions import NormallyClosed
+from .exceptions import NormallyClosed, RequestRejected
 from .group import AcGroup
+from .grouping import AcGroupBatcher
+from .latency import AcLatencyHistogram
+from .pending import REQUEST_TIMEOUT, AcPendingRequests
+from .poller import AcPropertyPoller
 from .scene import AcScene
-from .types import FloorInfo
+from .scheduler import AcPriority
+from .topology import AcTopologyDiff, parse_topology
+from .trace import AcFrameTrace
+from .types import DeviceInfo, FloorInfo, GroupInfo, SceneInfo
 
 _LOGGER = logging.getLogger(__name__)
 
+MessageHandler = Callable[[dict, dict], None]
+
+# 需要与在途请求匹配的响应
+PENDING_RESPONSES = {
+    ("ha", "get"),
+    ("device_control", "get"),
+    ("device_control", "set"),
+    ("scene_control", "trigger"),
+    ("group_control", "set"),
+}
+
+SYNC_WINDOW = 8  # 属性同步时同时在途的查询数
+SYNC_INTERVAL = 0.01  # 属性同步时两次查询之间的最小间隔（秒）
+SYNC_TIMEOUT = 5
+
+# 重连后重新同步的顺序：先同步用户最常看到的开关和窗帘状态，传感器、能耗等放在最后
+RESYNC_ORDER = {
+    action: rank
+    for rank, action in enumerate(
+        (ACTION_ONOFF, ACTION_POSITION, ACTION_LEVEL, ACTION_CW, ACTION_HSV)
+    )
+}
+
 
 class AcGateway:
-    def __init__(self, host: str, mac: str, token: str) -> None:
+    def __init__(
+        self,
+        host: str,
+        mac: str,
+        token: str,
+        transport_mode: AcTransportMode = AcTransportMode.STREAM,
+        **client_options: Any,
+    ) -> None:
+        """client_options 传给 AcClient，如限速和存活检测的各项时间."""
         self.mac = mac
-        self._client = AcClient(host, token, self._on_state_changed)
+        self._client = AcClient(
+            host, token, self._on_state_changed, transport_mode, **client_options
+        )
         self.devices: dict[str, AcDevice] = {}
         self.scenes: dict[int, AcScene] = {}
         self.groups: dict[int, AcGroup] = {}
-        self._pending_device_set: Future | None = None
-        self._pending_device_get: dict[(str, int, str), list[Future]] = {}
-        self._pending_scene_trigger: Future | None = None
-        self._pending_group_set: Future | None = None
+        # 按平台预先汇总的设备功能，设备列表变化时重建
+        self.capabilities: CapabilityIndex = {}
+        self._pending = AcPendingRequests()
+        # (namespace, command) => 帧写出到收到应答的时延
+        self.latency = {key: AcLatencyHistogram() for key in PENDING_RESPONSES}
+        self.coalescer = AcCommandCoalescer()
+        self.group_batcher = AcGroupBatcher(
+            self._send_device_property,
+            self.set_group_property,
+            lambda group_id: self.groups[group_id].supported_actions,
+        )
+        self.poller = AcPropertyPoller(
+            self._poll_property, self._reported_at, lambda: self.available
+        )
+        self._sync_pending: dict[tuple[str, int, str], None] = {}
+        self._sync_started = False
+        self._syncing = False
+        self._sync_task: asyncio.Task | None = None
+        self.sync_duration: float | None = None
+        # 所有登记过的属性，重连后全部重新同步
+        self._sync_keys: dict[tuple[str, int, str], None] = {}
+        self._resync_task: asyncio.Task | None = None
+        self.last_resync_duration: float | None = None
+        # 断线到重新同步完成（状态一致）的耗时
+        self.last_recovery_duration: float | None = None
+        # 设备属性上报计数：通知实体的 / 与上次相同被丢弃的
+        self.reports_forwarded = 0
+        self.reports_suppressed = 0
+        self.unknown_device_reports = 0  # 不在设备列表中的设备的上报
+        self.unhandled_messages = 0
+        self.failed_responses = 0  # success 为 false 的应答
+        # (namespace, type 或 response) => 消息处理函数
+        self._handlers: dict[tuple[str, str], MessageHandler] = {}
+        # (namespace, type, response) => 解析好的处理函数，每帧只需查一次
+        self._dispatch: dict[
+            tuple[str | None, str | None, str | None], MessageHandler
+        ] = {}
+        self.register_handler(
+            "device_control", "device_property", self._handle_device_property
+        )
+        for namespace, response in PENDING_RESPONSES:
+            self.register_handler(namespace, response, self._handle_pending_response)
+        self.register_handler(
+            "system", "ping", lambda head, body: self._client.watchdog.on_pong()
+        )
+
+    @cached_property
+    def unique_id(self) -> str:
+        return self.mac.replace(":", "")
 
     @property
     def available(self) -> bool:
@@ -30,6 +123,17 @@ class AcGateway:
     def _on_state_changed(self, status: AcClientStatus) -> None:
         _LOGGER.debug("status => %s", status.name)
         available = status == AcClientStatus.CONNECTED
+        if not available:
+            self._pending.fail_all(ConnectionError("与网关的连接已断开"))
+        elif (
+            self._sync_started
+            and (disconnected_at := self._client.disconnected_at) is not None
+        ):
+            if task := self._resync_task:
+                task.cancel()
+            self._resync_task = asyncio.get_running_loop().create_task(
+                self._resync(disconnected_at)
+            )
         for device in self.devices.values():
             device.set_available(available)
         for scene in self.scenes.values():
@@ -40,37 +144,35 @@ class AcGateway:
     async def connect(self) -> None:
         await self._client.connect()
 
+    async def connect_with_retry(self) -> None:
+        await self._client.connect_with_retry()
+
+    def retry_now(self) -> None:
+        """网关重新出现时立即重连."""
+        self._client.retry_now()
+
+    @property
+    def reconnect_count(self) -> int:
+        return self._client.reconnect_count
+
+    @property
+    def last_reconnect_duration(self) -> float | None:
+        return self._client.last_reconnect_duration
+
     async def get_ha_report(self):
         # [{'namespace': 'ha', 'response': 'get', 'success': False, 'type': 'none'}]
         return await self._client.get_ha_report()
 
     def init_devices(self, raw_data: list[FloorInfo], area_name_rule: str) -> None:
         _LOGGER.debug("开始解析设备列表")
-        for floor_info in raw_data:
-            floor_name = floor_info["floor_name"]
-            for room_info in floor_info["rooms"]:
-                if area_name_rule == "floor_room":
-                    suggested_area = f"{floor_name} {room_info['name']}"
-                elif area_name_rule == "room":
-                    suggested_area = f"{room_info['name']}"
-                elif area_name_rule == "floor":
-                    suggested_area = floor_name
-                else:
-                    suggested_area = None
-                for device_info in room_info["devices"]:
-                    device = AcDevice(self, device_info, suggested_area)
-                    self.devices[device_info["device_id"]] = device
-                for scene_info in room_info["scenes"]:
-                    scene = AcScene(
-                        self,
-                        scene_info,
-                        f"{floor_name} {room_info['name']}",
-                        suggested_area,
-                    )
-                    self.scenes[scene_info["scene_id"]] = scene
-                for group_info in room_info["groups"]:
-                    group = AcGroup(self, group_info, suggested_area)
-                    self.groups[group_info["group_id"]] = group
+        topology = parse_topology(raw_data, area_name_rule)
+        for device_info, suggested_area in topology.devices.values():
+            self._add_device(device_info, suggested_area)
+        for scene_info, room_name, suggested_area in topology.scenes.values():
+            self._add_scene(scene_info, room_name, suggested_area)
+        for group_info, suggested_area in topology.groups.values():
+            self._add_group(group_info, suggested_area)
+        self.capabilities = build_capability_index(self.devices.values())
         _LOGGER.debug(
             "解析成功, %s 个设备, %s 个场景, %s 个组",
             len(self.devices),
@@ -78,121 +180,383 @@ class AcGateway:
             len(self.groups),
         )
 
+    def _add_device(self, info: DeviceInfo, suggested_area: str | None) -> AcDevice:
+        device = self.devices[info["device_id"]] = AcDevice(self, info, suggested_area)
+        return device
+
+    def _add_scene(
+        self, info: SceneInfo, room_name: str, suggested_area: str | None
+    ) -> AcScene:
+        scene = AcScene(self, info, room_name, suggested_area)
+        self.scenes[info["scene_id"]] = scene
+        return scene
+
+    def _add_group(self, info: GroupInfo, suggested_area: str | None) -> AcGroup:
+        group = self.groups[info["group_id"]] = AcGroup(self, info, suggested_area)
+        return group
+
+    def reconcile(
+        self, raw_data: list[FloorInfo], area_name_rule: str
+    ) -> AcTopologyDiff:
+        """按新的设备列表增量更新设备、场景、群组.
+
+        未变化的对象（及其属性缓存、监听者）原样保留；改名的原地更新；
+        产品型号或群组类型改变的只记录在 replaced 中，由调用方决定如何处理。
+        """
+        topology = parse_topology(raw_data, area_name_rule)
+        diff = AcTopologyDiff()
+
+        for device_id, device in list(self.devices.items()):
+            if (entry := topology.devices.pop(device_id, None)) is None:
+                del self.devices[device_id]
+                self._forget_device(device_id)
+                diff.removed.append(device)
+                continue
+            info = entry[0]
+            if (info["product_key"], info.get("product_mode")) != (
+                device.product_key,
+                device.product_mode,
+            ):
+                diff.replaced.append(device)
+            elif info["name"] != device.device_name:
+                device.device_name = info["name"]
+                diff.renamed.append(device)
+        diff.added.extend(
+            self._add_device(info, suggested_area)
+            for info, suggested_area in topology.devices.values()
+        )
+
+        for scene_id, scene in list(self.scenes.items()):
+            if (entry := topology.scenes.pop(scene_id, None)) is None:
+                del self.scenes[scene_id]
+                diff.removed.append(scene)
+            elif entry[0]["name"] != scene.scene_name:
+                scene.scene_name = entry[0]["name"]
+                diff.renamed.append(scene)
+        diff.added.extend(
+            self._add_scene(info, room_name, suggested_area)
+            for info, room_name, suggested_area in topology.scenes.values()
+        )
+
+        for group_id, group in list(self.groups.items()):
+            if (entry := topology.groups.pop(group_id, None)) is None:
+                del self.groups[group_id]
+                self.group_batcher.forget_group(group_id)
+                diff.removed.append(group)
+            elif entry[0]["group_type"] != group.group_type:
+                diff.replaced.append(group)
+            elif entry[0]["name"] != group.group_name:
+                group.group_name = entry[0]["name"]
+                diff.renamed.append(group)
+        diff.added.extend(
+            self._add_group(info, suggested_area)
+            for info, suggested_area in topology.groups.values()
+        )
+
+        if diff.added or diff.removed:
+            self.capabilities = build_capability_index(self.devices.values())
+        for unit in diff.removed:
+            unit.set_available(False)
+        for unit in diff.renamed:
+            unit.notify_info_changed()
+        if diff:
+            _LOGGER.info("设备列表已更新: %s", diff)
+        return diff
+
+    def _forget_device(self, device_id: str) -> None:
+        """清理已删除设备的同步登记和群组成员."""
+        for key in [key for key in self._sync_keys if key[0] == device_id]:
+            del self._sync_keys[key]
+            self._sync_pending.pop(key, None)
+        self.group_batcher.forget_device(device_id)
+
+    async def fetch_topology(self, timeout: float = REQUEST_TIMEOUT) -> dict:
+        """主循环运行时重新获取设备列表，返回 ha/get 响应的 body."""
+        message = self._client.encode_template(HA_REPORT)
+        return await self._request(HA_REPORT.head, message, timeout=timeout)
+
+    def stats(self) -> dict:
+        """协议层及消息分发的计数、在途请求和设备列表规模."""
+        return {
+            "client": self._client.stats(),
+            "dispatch": {
+                "reports_forwarded": self.reports_forwarded,
+                "reports_suppressed": self.reports_suppressed,
+                "unknown_device_reports": self.unknown_device_reports,
+                "unhandled_messages": self.unhandled_messages,
+                "failed_responses": self.failed_responses,
+                "handlers": len(self._handlers),
+            },
+            "pending": {
+                "requests": len(self._pending),
+                "coalescing": len(self.coalescer),
+                "superseded": self.coalescer.superseded,
+                "group_collapsed": self.group_batcher.collapsed,
+                "sync_queued": len(self._sync_pending),
+            },
+            "sync": {
+                "properties": len(self._sync_keys),
+                "sync_duration": self.sync_duration,
+                "last_resync_duration": self.last_resync_duration,
+                "last_recovery_duration": self.last_recovery_duration,
+            },
+            "poller": self.poller.stats(),
+            "topology": {
+                "devices": len(self.devices),
+                "scenes": len(self.scenes),
+                "groups": len(self.groups),
+                "confirmed_groups": len(self.group_batcher.confirmed),
+            },
+        }
+
     async def start_main_loop(self) -> None:
         _LOGGER.debug("start_main_loop")
         try:
-            async for response in self._client.take_response():
-                _LOGGER.debug("<= %s", response)
-                if isinstance(response, list):
-                    self._handle_message(
-                        response[0], response[1] if len(response) > 1 else {}
-                    )
-                else:
-                    _LOGGER.warning("<= 未处理的消息: %s", response)
+            await self._client.serve(self._handle_response)
         except NormallyClosed:
             _LOGGER.debug("正常关闭，结束主循环")
         except Exception as e:
             _LOGGER.error("出现错误，请尝试重载集成: %s", e)
 
+    @property
+    def trace(self) -> AcFrameTrace:
+        """最近收发帧的记录."""
+        return self._client.trace
+
+    def _handle_response(self, response: list[dict] | dict) -> None:
+        if isinstance(response, list):
+            self._handle_message(response[0], response[1] if len(response) > 1 else {})
+        else:
+            self.unhandled_messages += 1
+            _LOGGER.warning("<= 未处理的消息: %s", response)
+
+    def register_handler(
+        self, namespace: str, kind: str, handler: MessageHandler
+    ) -> Callable[[], None]:
+        """注册消息处理函数.
+
+        kind 为消息头中的 type 或 response，两者都能匹配时 type 优先。
+        """
+        key = (namespace, kind)
+        self._handlers[key] = handler
+        self._dispatch.clear()
+        return lambda: self._unregister_handler(key)
+
+    def _unregister_handler(self, key: tuple[str, str]) -> None:
+        self._handlers.pop(key, None)
+        self._dispatch.clear()
+
+    def _resolve_handler(
+        self, key: tuple[str | None, str | None, str | None]
+    ) -> MessageHandler:
+        namespace, tp, resp = key
+        handler = (
+            self._handlers.get((namespace, tp))
+            or self._handlers.get((namespace, resp))
+            or self._handle_unknown
+        )
+        self._dispatch[key] = handler
+        return handler
+
     def _handle_message(self, head: dict, body: dict) -> None:
         """处理接收到的消息."""
-        success = head.get("success")
-        if success is False:
+        if head.get("success") is False:
+            self.failed_responses += 1
             _LOGGER.warning("Error: message not success: %s", head)
+            if (namespace := head.get("namespace")) and (
+                command := head.get("response")
+            ):
+                # 对应的请求立即失败，不必等到超时
+                self._pending.reject(namespace, command, RequestRejected(head), body)
             return
-        ns = head.get("namespace")
-        resp = head.get("response")
-        tp = head.get("type")
-        if ns == "device_control" and tp == "device_property":
-            device_id = body.get("device_id")
-            if device_id in self.devices:
-                self.devices[device_id].update_property(body)
-            else:
-                _LOGGER.warning("未知设备消息 %s", device_id)
-        elif ns == "device_control" and resp == "get":
-            key = (body["device_id"], body["endpoint"], body["action"])
-            if pending := self._pending_device_get.get(key):
-                pending.pop(0).set_result(body)
-        elif ns == "device_control" and resp == "set":
-            if self._pending_device_set:
-                self._pending_device_set.set_result(body)
-                self._pending_device_set = None
-        elif ns == "scene_control" and resp == "trigger":
-            if self._pending_scene_trigger:
-                self._pending_scene_trigger.set_result(body)
-                self._pending_scene_trigger = None
-        elif ns == "group_control" and resp == "set":
-            if self._pending_group_set:
-                self._pending_group_set.set_result(body)
-                self._pending_group_set = None
-        elif ns == "system" and resp == "ping":
-            pass
+        key = (head.get("namespace"), head.get("type"), head.get("response"))
+        if (handler := self._dispatch.get(key)) is None:
+            handler = self._resolve_handler(key)
+        handler(head, body)
+
+    def _handle_unknown(self, head: dict, body: dict) -> None:
+        self.unhandled_messages += 1
+        _LOGGER.warning("未处理的消息: %s %s", head, body)
+
+    def _handle_device_property(self, head: dict, body: dict) -> None:
+        device_id = body.get("device_id")
+        if "response" not in head:
+            self.group_batcher.observe_report(body)
+        if device := self.devices.get(device_id):
+            device.update_property(body)
         else:
-            _LOGGER.warning("未处理的消息: %s %s", head, body)
+            self.unknown_device_reports += 1
+            _LOGGER.warning("未知设备消息 %s", device_id)
+        if head.get("response") == "get":
+            self._pending.resolve("device_control", "get", body)
+
+    def _handle_pending_response(self, head: dict, body: dict) -> None:
+        self._pending.resolve(head["namespace"], head["response"], body)
 
     async def close(self) -> None:
+        self.poller.stop()
         await self._client.close()
 
-    async def start_ping_loop(self) -> None:
-        await self._client.loop_ping()
+    @property
+    def ping_rtt(self) -> float | None:
+        """心跳往返时延的平均值（秒），链路一直繁忙、没有发送过心跳时为 None."""
+        return self._client.watchdog.rtt_avg
+
+    async def _request(
+        self,
+        head: dict,
+        message: bytes,
+        match: dict | None = None,
+        timeout: float = REQUEST_TIMEOUT,
+        priority: AcPriority = AcPriority.INTERACTIVE,
+    ) -> dict:
+        """发送已编码的命令并等待对应的响应.
+
+        match: 响应中用于匹配请求的字段，响应不带这些字段时按发送顺序匹配
+        时延从帧写出开始计算，不含调度器中的排队时间。
+        """
+        namespace = head["namespace"]
+        command = head["command"]
+        histogram = self.latency[(namespace, command)]
+        future = self._pending.add(namespace, command, match)
+        try:
+            await self._client.send_frame(message, head, priority)
+            written = time.monotonic()
+            async with asyncio.timeout(timeout):
+                response = await future
+        except TimeoutError:
+            histogram.timeouts += 1
+            raise
+        finally:
+            self._pending.discard(namespace, command, future)
+        histogram.record(time.monotonic() - written)
+        return response
 
     async def set_device_property(
         self, device_id: str, endpoint: int, action: str, data: dict
-    ) -> None:
-        feature = Future()
-        self._pending_device_set = feature
-        await self._client.send_command(
-            [
-                {"namespace": "device_control", "command": "set"},
-                {
-                    "device_id": device_id,
-                    "endpoint": endpoint,
-                    "action": action,
-                    "property": data,
-                },
-            ]
-        )
-        return await feature
+    ) -> dict:
+        """设置设备属性，同一轮中覆盖整个群组的同值设置会合并为群组命令."""
+        return await self.group_batcher.set_device_property(
+            device_id, endpoint, action, data
+        )
+
+    async def _send_device_property(
+        self, device_id: str, endpoint: int, action: str, data: dict
+    ) -> dict:
+        message = self._client.encode_template(
+            DEVICE_SET, device_id, endpoint, action, data
+        )
+        return await self._request(
+            DEVICE_SET.head,
+            message,
+            {"device_id": device_id, "endpoint": endpoint, "action": action},
+        )
 
     async def get_device_property(
-        self, device_id: str, endpoint: int, action: str
-    ) -> None:
-        await self._client.send_command(
-            [
-                {"namespace": "device_control", "command": "get"},
-                {
-                    "device_id": device_id,
-                    "endpoint": endpoint,
-                    "action": action,
-                },
-            ]
-        )
-
-    async def trigger_scene(self, scene_id: int) -> None:
-        feature = Future()
-        self._pending_scene_trigger = feature
-        await self._client.send_command(
-            [
-                {"namespace": "scene_control", "command": "trigger"},
-                {"scene_id": scene_id},
-            ]
-        )
-        return await feature
-
-    async def set_group_property(self, group_id: int, action: str, data: dict) -> None:
-        feature = Future()
-        self._pending_group_set = feature
-        await self._client.send_command(
-            [
-                {"namespace": "group_control", "command": "set"},
-                {
-                    "group_id": group_id,
-                    "action": action,
-                    "property": data,
-                },
-            ]
-        )
-        return await feature
+        self,
+        device_id: str,
+        endpoint: int,
+        action: str,
+        timeout: float = REQUEST_TIMEOUT,
+        priority: AcPriority = AcPriority.INTERACTIVE,
+    ) -> dict:
+        query = {"device_id": device_id, "endpoint": endpoint, "action": action}
+        message = self._client.encode_template(DEVICE_GET, device_id, endpoint, action)
+        return await self._request(DEVICE_GET.head, message, query, timeout, priority)
+
+    async def _poll_property(self, device_id: str, endpoint: int, action: str) -> dict:
+        return await self.get_device_property(
+            device_id, endpoint, action, priority=AcPriority.BACKGROUND
+        )
+
+    def _reported_at(self, device_id: str, endpoint: int, action: str) -> float | None:
+        if device := self.devices.get(device_id):
+            return device.get_cached_time(endpoint, action)
+        return None
+
+    def queue_sync(self, device_id: str, endpoint: int, action: str) -> None:
+        """登记需要从网关同步的属性.
+
+        启动同步开始前登记的属性会去重后在 start_sync 中统一查询，之后登记的立即查询。
+        """
+        self._sync_pending[(device_id, endpoint, action)] = None
+        self._sync_keys[(device_id, endpoint, action)] = None
+        if self._sync_started and not self._syncing:
+            self._syncing = True
+            self._sync_task = asyncio.get_running_loop().create_task(self._sync())
+
+    async def start_sync(self) -> None:
+        """启动阶段的属性同步."""
+        self._sync_started = True
+        self._syncing = True
+        start = time.monotonic()
+        count = len(self._sync_pending)
+        await self._sync()
+        self.sync_duration = time.monotonic() - start
+        _LOGGER.info("启动同步完成: %s 项属性, 耗时 %.2f 秒", count, self.sync_duration)
+
+    async def _resync(self, disconnected_at: float) -> None:
+        """重连后按优先级重新同步所有已知属性，断线期间的变化不会有上报."""
+        queries = sorted(
+            self._sync_keys, key=lambda query: RESYNC_ORDER.get(query[2], 99)
+        )
+        start = time.monotonic()
+        await self._fetch_properties(queries)
+        now = time.monotonic()
+        self.last_resync_duration = now - start
+        self.last_recovery_duration = now - disconnected_at
+        _LOGGER.info(
+            "重连后同步完成: %s 项属性, 耗时 %.2f 秒, 断线至状态一致 %.2f 秒",
+            len(queries),
+            self.last_resync_duration,
+            self.last_recovery_duration,
+        )
+
+    async def _sync(self) -> None:
+        try:
+            while self._sync_pending:
+                queries = list(self._sync_pending)
+                self._sync_pending.clear()
+                await self._fetch_properties(queries)
+        finally:
+            self._syncing = False
+
+    async def _fetch_properties(self, queries: list[tuple[str, int, str]]) -> None:
+        """按固定节奏发送查询，同时在途的查询不超过 SYNC_WINDOW."""
+        window = asyncio.Semaphore(SYNC_WINDOW)
+        failed = 0
+
+        async def fetch(query: tuple[str, int, str]) -> None:
+            nonlocal failed
+            try:
+                await self.get_device_property(
+                    *query, timeout=SYNC_TIMEOUT, priority=AcPriority.SYNC
+                )
+            except (TimeoutError, ConnectionError, RequestRejected) as e:
+                failed += 1
+                _LOGGER.debug("属性同步失败 %s: %r", query, e)
+            finally:
+                window.release()
+
+        tasks: list[asyncio.Task] = []
+        for query in queries:
+            await window.acquire()
+            tasks.append(asyncio.create_task(fetch(query)))
+            await asyncio.sleep(SYNC_INTERVAL)
+        await asyncio.gather(*tasks)
+        if failed:
+            _LOGGER.warning("属性同步: %s/%s 项查询失败", failed, len(queries))
+
+    async def trigger_scene(self, scene_id: int) -> dict:
+        message = self._client.encode_template(SCENE_TRIGGER, scene_id)
+        return await self._request(SCENE_TRIGGER.head, message, {"scene_id": scene_id})
+
+    async def set_group_property(self, group_id: int, action: str, data: dict) -> dict:
+        self.group_batcher.observe_group_set(group_id, action)
+        message = self._client.encode_template(GROUP_SET, group_id, action, data)
+        return await self._request(
+            GROUP_SET.head, message, {"group_id": group_id, "action": action}
+        )
 
     async def ensure_alive(self):
         await self._client.ensure_alive()
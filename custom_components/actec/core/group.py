@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-from functools import cached_property
 from typing import TYPE_CHECKING
 
 from .const import (
@@ -24,7 +23,21 @@ if TYPE_CHECKING:
     from .gateway import AcGateway
 
 
+# 各类型群组支持的 action
+GROUP_ACTIONS: dict[GroupType, frozenset[str]] = {
+    GroupType.ON_OFF: frozenset({ACTION_ONOFF}),
+    GroupType.BRIGHTNESS: frozenset({ACTION_ONOFF, ACTION_LEVEL}),
+    GroupType.COLOR_TEMP: frozenset({ACTION_ONOFF, ACTION_LEVEL, ACTION_CW}),
+    GroupType.RGB_COLOR_TEMP: frozenset(
+        {ACTION_ONOFF, ACTION_LEVEL, ACTION_CW, ACTION_HSV}
+    ),
+    GroupType.CURTAIN: frozenset({ACTION_POSITION}),
+}
+
+
 class AcGroup(AcBaseUnit):
+    __slots__ = ("group_id", "group_name", "group_type")
+
     def __init__(
         self, gateway: AcGateway, info: GroupInfo, suggested_area: str | None
     ) -> None:
@@ -33,9 +46,23 @@ class AcGroup(AcBaseUnit):
         self.group_id: int = info["group_id"]
         self.group_name: str = info["name"]
 
-    @cached_property
+    @property
     def unique_id(self) -> str:
-        return f"{self.gateway.mac.replace(':', '')}_group_{self.group_id}"
+        return f"{self.gateway.unique_id}_group_{self.group_id}"
+
+    @property
+    def supported_actions(self) -> frozenset[str]:
+        return GROUP_ACTIONS.get(self.group_type, frozenset())
+
+    async def _set_property_latest(self, action: str, data: dict) -> None:
+        """连续设置时只发送最新的值，见 AcCommandCoalescer.
+
+        等待发送时被关灯丢弃则抛出 CommandDropped。
+        """
+        await self.gateway.coalescer.submit(
+            (self.group_id, action),
+            lambda: self.gateway.set_group_property(self.group_id, action, data),
+        )
 
     async def set_onoff(self, on: bool):
         """Turn on/off the device.
@@ -44,6 +71,9 @@ class AcGroup(AcBaseUnit):
             on (bool): True for on, False for off
 
         """
+        if not on:
+            for action in (ACTION_LEVEL, ACTION_CW, ACTION_HSV):
+                self.gateway.coalescer.drop((self.group_id, action))
         await self.gateway.set_group_property(
             self.group_id, ACTION_ONOFF, {PROP_ONOFF: 1 if on else 0}
         )
@@ -55,9 +85,7 @@ class AcGroup(AcBaseUnit):
             brightness (float): 0.0-100.0
 
         """
-        await self.gateway.set_group_property(
-            self.group_id, ACTION_LEVEL, {PROP_LEVEL: brightness}
-        )
+        await self._set_property_latest(ACTION_LEVEL, {PROP_LEVEL: brightness})
 
     async def set_color_temp(self, color_temp: int):
         """Set color temperature of the light.
@@ -66,9 +94,7 @@ class AcGroup(AcBaseUnit):
             color_temp (int): 2700-6500
 
         """
-        await self.gateway.set_group_property(
-            self.group_id, ACTION_CW, {PROP_CW: color_temp}
-        )
+        await self._set_property_latest(ACTION_CW, {PROP_CW: color_temp})
 
     async def set_hsv(self, hue: float, saturation: float, value: float):
         """Set HSV color of the light.
@@ -79,8 +105,7 @@ class AcGroup(AcBaseUnit):
             value (float): 0.0-100.0
 
         """
-        await self.gateway.set_group_property(
-            self.group_id,
+        await self._set_property_latest(
             ACTION_HSV,
             {PROP_H: hue, PROP_S: saturation, PROP_V: value},
         )
@@ -92,6 +117,4 @@ class AcGroup(AcBaseUnit):
             position (int): 0-100
 
         """
-        await self.gateway.set_group_property(
-            self.group_id, ACTION_POSITION, {PROP_POSITION: position}
-        )
+        await self._set_property_latest(ACTION_POSITION, {PROP_POSITION: position})
@@ -0,0 +1,188 @@
+"""把同一轮事件循环中的多灯设置合并为网关群组命令."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+
+from .const import KEY_ACTION, KEY_ENDPOINT
+
+_LOGGER = logging.getLogger(__name__)
+
+GROUP_OBSERVE_WINDOW = 1.0  # 发送群组命令后收集成员上报的秒数
+
+Member = tuple[str, int]  # (device_id, endpoint)
+DeviceSend = Callable[[str, int, str, dict], Awaitable[dict]]
+GroupSend = Callable[[int, str, dict], Awaitable[dict]]
+
+
+class _Observation:
+    __slots__ = ("action", "ambiguous", "members")
+
+    def __init__(self, action: str) -> None:
+        self.action = action
+        self.members: set[Member] = set()
+        self.ambiguous = False  # 收到过无法区分归属的上报，本次观察作废
+
+
+class AcGroupBatcher:
+    """学习群组成员，并把覆盖整个群组的同值设备命令合并为一条群组命令.
+
+    网关的设备列表不含群组成员，这里通过群组命令之后的设备上报来学习：
+    每次发送群组设置后 GROUP_OBSERVE_WINDOW 秒内上报了同一 action 的设备端点记为一次观察。
+    同一 action 有多个观察同时进行时，上报无法区分属于哪个群组，这些观察全部作废。
+    成员多记或少记都会让合并出错，因此连续两次观察完全一致才认为成员已确认，
+    任何一次不一致都会取消确认。只对已确认的群组做合并，合并发出的群组命令本身也是观察。
+
+    同一轮事件循环内到达的设备设置按 (action, property) 分桶，桶内设备完整覆盖的
+    已确认群组改为发送一条群组命令，其余设备仍逐个发送。
+    """
+
+    def __init__(
+        self,
+        send_device: DeviceSend,
+        send_group: GroupSend,
+        group_actions: Callable[[int], frozenset[str]],
+    ) -> None:
+        self._send_device = send_device
+        self._send_group = send_group
+        self._group_actions = group_actions
+        self.members: dict[int, set[Member]] = {}
+        self.confirmed: set[int] = set()
+        self.collapsed = 0  # 被群组命令代替的设备命令数
+        self._observations: dict[int, _Observation] = {}
+        self._batch: list[tuple[str, int, str, dict, asyncio.Future[dict]]] = []
+        self._flush_handle: asyncio.Handle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    # 成员学习
+
+    def observe_group_set(self, group_id: int, action: str) -> None:
+        """即将发送群组设置，开始收集成员上报."""
+        if group_id in self._observations:
+            return
+        self._observations[group_id] = _Observation(action)
+        asyncio.get_running_loop().call_later(
+            GROUP_OBSERVE_WINDOW, self._finish_observation, group_id
+        )
+
+    def observe_report(self, body: dict) -> None:
+        """设备属性主动上报，查询的应答不能用来学习."""
+        if not self._observations:
+            return
+        action = body.get(KEY_ACTION)
+        observing = [
+            observation
+            for observation in self._observations.values()
+            if observation.action == action
+        ]
+        if len(observing) == 1:
+            observing[0].members.add((body.get("device_id"), body.get(KEY_ENDPOINT)))
+        else:
+            for observation in observing:
+                observation.ambiguous = True
+
+    def _finish_observation(self, group_id: int) -> None:
+        observation = self._observations.pop(group_id)
+        seen = observation.members
+        if not seen or observation.ambiguous:
+            return
+        if self.members.get(group_id) == seen:
+            if group_id not in self.confirmed:
+                _LOGGER.debug("群组 %s 成员已确认: %s 个", group_id, len(seen))
+                self.confirmed.add(group_id)
+        else:
+            self.members[group_id] = seen
+            self.confirmed.discard(group_id)
+
+    def forget_group(self, group_id: int) -> None:
+        """群组已被删除."""
+        self.members.pop(group_id, None)
+        self.confirmed.discard(group_id)
+
+    def forget_device(self, device_id: str) -> None:
+        """设备已被删除，包含它的群组需要重新学习."""
+        for group_id, members in self.members.items():
+            if any(member[0] == device_id for member in members):
+                self.confirmed.discard(group_id)
+
+    # 命令合并
+
+    async def set_device_property(
+        self, device_id: str, endpoint: int, action: str, data: dict
+    ) -> dict:
+        """登记设备设置，在本轮事件循环结束后统一发送."""
+        if not self.confirmed:
+            return await self._send_device(device_id, endpoint, action, data)
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._batch.append((device_id, endpoint, action, data, future))
+        if self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        self._flush_handle = None
+        batch = self._batch
+        self._batch = []
+        buckets: dict[tuple[str, tuple], dict[Member, list[asyncio.Future[dict]]]] = {}
+        for device_id, endpoint, action, data, future in batch:
+            key = (action, tuple(data.items()))
+            buckets.setdefault(key, {}).setdefault((device_id, endpoint), []).append(
+                future
+            )
+        for (action, items), targets in buckets.items():
+            data = dict(items)
+            remaining = set(targets)
+            for group_id in self._covering_groups(action, remaining):
+                members = self.members[group_id]
+                remaining -= members
+                futures = [f for member in members for f in targets[member]]
+                self.collapsed += len(futures)
+                self._spawn(self._send_group(group_id, action, data), futures)
+            for device_id, endpoint in remaining:
+                self._spawn(
+                    self._send_device(device_id, endpoint, action, data),
+                    targets[(device_id, endpoint)],
+                )
+
+    def _covering_groups(self, action: str, targets: set[Member]) -> list[int]:
+        """成员都在 targets 中、可用群组命令代替的群组，成员多的优先，互不重叠."""
+        candidates = sorted(
+            (
+                group_id
+                for group_id in self.confirmed
+                if action in self._group_actions(group_id)
+                and self.members[group_id] <= targets
+            ),
+            key=lambda group_id: len(self.members[group_id]),
+            reverse=True,
+        )
+        chosen: list[int] = []
+        covered: set[Member] = set()
+        for group_id in candidates:
+            members = self.members[group_id]
+            if members.isdisjoint(covered):
+                chosen.append(group_id)
+                covered |= members
+        return chosen
+
+    def _spawn(
+        self, send: Awaitable[dict], futures: list[asyncio.Future[dict]]
+    ) -> None:
+        async def run() -> None:
+            try:
+                result = await send
+            except Exception as e:
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for future in futures:
+                    if not future.done():
+                        future.set_result(result)
+
+        task = asyncio.get_running_loop().create_task(run())
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
@@ -0,0 +1,68 @@
+"""请求往返时延统计."""
+
+from bisect import bisect_left
+
+# 直方图各桶的上界（毫秒），最后一个桶收集超出的部分
+LATENCY_BUCKETS = (2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+
+
+class AcLatencyHistogram:
+    """固定分桶的往返时延直方图.
+
+    记录一次只做一次二分查找和几个整数加法，可以常驻开启；
+    分位数按桶内均匀分布插值，精度取决于桶的宽度。
+    """
+
+    __slots__ = ("buckets", "count", "max", "timeouts", "total")
+
+    def __init__(self) -> None:
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.timeouts = 0
+
+    def record(self, seconds: float) -> None:
+        ms = seconds * 1000
+        self.buckets[bisect_left(LATENCY_BUCKETS, ms)] += 1
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+
+    def percentile(self, q: float) -> float | None:
+        """第 q 分位（0~1）的时延毫秒数，没有样本时为 None."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, bucket in enumerate(self.buckets):
+            upper = (
+                float(LATENCY_BUCKETS[index])
+                if index < len(LATENCY_BUCKETS)
+                else self.max
+            )
+            if bucket and seen + bucket >= rank:
+                value = lower + (upper - lower) * (rank - seen) / bucket
+                return round(min(value, self.max), 1)
+            seen += bucket
+            lower = upper
+        return round(self.max, 1)
+
+    def as_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "timeouts": self.timeouts,
+            "avg_ms": round(self.total / self.count, 1) if self.count else None,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max, 1),
+            "buckets": dict(
+                zip(
+                    [f"<={bound}" for bound in LATENCY_BUCKETS] + ["inf"],
+                    self.buckets,
+                    strict=True,
+                )
+            ),
+        }
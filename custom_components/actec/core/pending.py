@@ -0,0 +1,82 @@
+"""在途请求表."""
+
+import asyncio
+from collections import deque
+
+REQUEST_TIMEOUT = 10
+
+
+class AcPendingRequests:
+    """按 (namespace, command) 维护在途请求.
+
+    响应中带有请求时登记的匹配字段（如 device_id/endpoint/action）时按字段匹配，
+    否则按发送顺序（FIFO）匹配最早的请求。
+    """
+
+    def __init__(self) -> None:
+        self._queues: dict[
+            tuple[str, str], deque[tuple[dict | None, asyncio.Future[dict]]]
+        ] = {}
+
+    def add(
+        self, namespace: str, command: str, match: dict | None = None
+    ) -> asyncio.Future[dict]:
+        """登记一个请求，返回等待响应的 Future."""
+        future = asyncio.get_running_loop().create_future()
+        self._queues.setdefault((namespace, command), deque()).append((match, future))
+        return future
+
+    def discard(
+        self, namespace: str, command: str, future: asyncio.Future[dict]
+    ) -> None:
+        """移除请求（已完成、超时或发送失败）."""
+        if not (queue := self._queues.get((namespace, command))):
+            return
+        for entry in queue:
+            if entry[1] is future:
+                queue.remove(entry)
+                break
+
+    def resolve(self, namespace: str, command: str, body: dict) -> bool:
+        """用响应完成对应的请求，没有匹配的请求时返回 False."""
+        if future := self._take(namespace, command, body):
+            future.set_result(body)
+            return True
+        return False
+
+    def reject(self, namespace: str, command: str, exc: Exception, body: dict) -> bool:
+        """网关拒绝了请求，让对应的请求立即失败，没有匹配的请求时返回 False."""
+        if future := self._take(namespace, command, body):
+            future.set_exception(exc)
+            return True
+        return False
+
+    def _take(
+        self, namespace: str, command: str, body: dict
+    ) -> asyncio.Future[dict] | None:
+        """取出与响应匹配的请求."""
+        if not (queue := self._queues.get((namespace, command))):
+            return None
+        for entry in queue:
+            match, future = entry
+            if future.done():
+                continue
+            if match and any(
+                key in body and body[key] != value for key, value in match.items()
+            ):
+                continue
+            queue.remove(entry)
+            return future
+        return None
+
+    def fail_all(self, exc: Exception) -> None:
+        """连接断开，所有在途请求都不会再有响应."""
+        for queue in self._queues.values():
+            for _, future in queue:
+                if not future.done():
+                    future.set_exception(exc)
+            queue.clear()
+
+    def __len__(self) -> int:
+        """在途请求数量."""
+        return sum(len(queue) for queue in self._queues.values())
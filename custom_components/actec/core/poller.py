@@ -0,0 +1,127 @@
+"""需要定时查询的属性（如能耗）的统一轮询."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+import logging
+import time
+
+from .exceptions import RequestRejected
+
+_LOGGER = logging.getLogger(__name__)
+
+POLL_INTERVAL = 60.0  # 每个属性的轮询周期（秒）
+
+PollKey = tuple[str, int, str]  # (device_id, endpoint, action)
+
+
+class AcPropertyPoller:
+    """用一个定时器把所有属性的查询均匀分散在轮询周期内.
+
+    各实体各自轮询时，同一分钟内的查询会在同一秒发出。这里按登记顺序轮流查询，
+    相邻两次查询间隔 interval / 属性数量。距离上一次查询之后收到过该属性的主动上报、
+    且上报还不到一个周期的，本轮跳过。
+    """
+
+    def __init__(
+        self,
+        fetch: Callable[[str, int, str], Awaitable[dict]],
+        reported_at: Callable[[str, int, str], float | None],
+        available: Callable[[], bool],
+        interval: float = POLL_INTERVAL,
+    ) -> None:
+        self._fetch = fetch
+        self._reported_at = reported_at
+        self._available = available
+        self.interval = interval
+        self._keys: list[PollKey] = []
+        self._cursor = 0
+        self._polled_at: dict[PollKey, float] = {}
+        self._handle: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self.polled = 0
+        self.skipped = 0  # 因近期有主动上报而跳过的查询
+        self.failed = 0
+
+    def register(
+        self, device_id: str, endpoint: int, action: str
+    ) -> Callable[[], None]:
+        """登记需要轮询的属性，返回取消登记的函数."""
+        key = (device_id, endpoint, action)
+        self._keys.append(key)
+        if self._handle is None:
+            self._schedule()
+        return lambda: self._unregister(key)
+
+    def _unregister(self, key: PollKey) -> None:
+        if key in self._keys:
+            index = self._keys.index(key)
+            del self._keys[index]
+            if index < self._cursor:
+                self._cursor -= 1
+        if key not in self._keys:
+            self._polled_at.pop(key, None)
+        if not self._keys:
+            self.stop()
+
+    def stop(self) -> None:
+        if handle := self._handle:
+            self._handle = None
+            handle.cancel()
+
+    @property
+    def spacing(self) -> float:
+        """相邻两次查询的间隔（秒）."""
+        return self.interval / max(len(self._keys), 1)
+
+    def _schedule(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._handle = loop.call_at(loop.time() + self.spacing, self._tick)
+
+    def _tick(self) -> None:
+        self._handle = None
+        if not self._keys:
+            return
+        if self._cursor >= len(self._keys):
+            self._cursor = 0
+        key = self._keys[self._cursor]
+        self._cursor += 1
+        if self._available():
+            self._poll(key)
+        self._schedule()
+
+    def _poll(self, key: PollKey) -> None:
+        now = time.monotonic()
+        reported = self._reported_at(*key)
+        if (
+            reported is not None
+            and reported > self._polled_at.get(key, 0.0)
+            and now - reported < self.interval
+        ):
+            self.skipped += 1
+            return
+        self.polled += 1
+        task = asyncio.get_running_loop().create_task(self._run(key))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, key: PollKey) -> None:
+        try:
+            await self._fetch(*key)
+        except (TimeoutError, ConnectionError, RequestRejected) as e:
+            self.failed += 1
+            _LOGGER.debug("轮询失败 %s: %r", key, e)
+        else:
+            # 应答已写入属性缓存，之后更新的缓存才是主动上报
+            self._polled_at[key] = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "properties": len(self._keys),
+            "interval": self.interval,
+            "budget_per_minute": round(len(self._keys) * 60 / self.interval, 1),
+            "polled": self.polled,
+            "skipped": self.skipped,
+            "failed": self.failed,
+        }
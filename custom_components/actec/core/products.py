@@ -1,3 +1,5 @@
+from .types import ProductMode
+
 PRODUCTS_INFO: dict[str, list[dict]] = {
     "16": [  # 1路开关面板
         {"endpoint": 2, "platform": "switch", "type": "switch"},
@@ -97,7 +99,7 @@ PRODUCTS_INFO: dict[str, list[dict]] = {
         {"endpoint": 2, "platform": "light", "type": "brightness"},
     ],
     "768": [
-        # 代码内特殊处理
+        # 按 product_mode 区分，见 MODE_PRODUCTS_INFO
     ],
     "4097": [  # rgbtw驱动器
         {"endpoint": 1, "platform": "light", "type": "hs_color_temp"},
@@ -139,9 +141,35 @@ PRODUCTS_INFO: dict[str, list[dict]] = {
         {"endpoint": 1, "platform": "binary_sensor", "type": "motion"},
     ],
     "5120": [
-        # 代码内特殊处理
+        # 按 product_mode 区分，见 MODE_PRODUCTS_INFO
     ],
     "5121": [
-        # 代码内特殊处理
+        # 按 product_mode 区分，见 MODE_PRODUCTS_INFO
+    ],
+}
+
+# 端点和功能取决于 product_mode 的产品，未列出的模式不创建实体
+MODE_PRODUCTS_INFO: dict[tuple[str, ProductMode], list[dict]] = {
+    ("768", ProductMode.ON_OFF): [
+        {"endpoint": 2, "platform": "switch", "type": "switch"},
+        {"endpoint": 3, "platform": "switch", "type": "switch"},
+    ],
+    ("768", ProductMode.CURTAIN): [
+        {"endpoint": 2, "platform": "cover", "type": "curtain"},
+    ],
+    ("5120", ProductMode.BRIGHTNESS): [
+        {"endpoint": 2, "platform": "light", "type": "brightness"},
+        {"endpoint": 3, "platform": "light", "type": "brightness"},
+    ],
+    ("5120", ProductMode.COLOR_TEMP): [
+        {"endpoint": 2, "platform": "light", "type": "color_temp"},
+    ],
+    ("5121", ProductMode.BRIGHTNESS): [
+        {"endpoint": endpoint, "platform": "light", "type": "brightness"}
+        for endpoint in range(2, 10)
+    ],
+    ("5121", ProductMode.COLOR_TEMP): [
+        {"endpoint": endpoint, "platform": "light", "type": "color_temp"}
+        for endpoint in (2, 4, 6, 8)
     ],
 }
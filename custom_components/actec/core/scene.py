@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from functools import cached_property
+import sys
 from typing import TYPE_CHECKING
 
 from .types import SceneInfo
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 
 class AcScene(AcBaseUnit):
+    __slots__ = ("room_name", "scene_id", "scene_name")
+
     def __init__(
         self,
         gateway: AcGateway,
@@ -21,11 +23,11 @@ class AcScene(AcBaseUnit):
         super().__init__(gateway, suggested_area)
         self.scene_id: int = info["scene_id"]
         self.scene_name: str = info["name"]
-        self.room_name: str = room_name
+        self.room_name: str = sys.intern(room_name)
 
-    @cached_property
+    @property
     def unique_id(self) -> str:
-        return f"{self.gateway.mac.replace(':', '')}_scene_{self.scene_id}"
+        return f"{self.gateway.unique_id}_scene_{self.scene_id}"
 
     async def trigger_scene(self) -> None:
         """Trigger the scene."""
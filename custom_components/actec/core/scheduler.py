@@ -0,0 +1,108 @@
+"""出站命令的优先级调度."""
+
+import asyncio
+from collections import deque
+from enum import IntEnum
+import time
+
+SEND_RATE = 100.0  # 令牌桶速率：每秒最多发送的帧数
+SEND_BURST = 32  # 令牌桶容量：允许的突发帧数
+
+
+class AcPriority(IntEnum):
+    INTERACTIVE = 0  # 用户操作、自动化
+    SYNC = 1  # 启动及后台的属性同步
+    BACKGROUND = 2  # 心跳、能耗轮询
+
+
+class _PriorityStats:
+    __slots__ = ("max_depth", "sent", "wait_max", "wait_total")
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.max_depth = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+
+class AcCommandScheduler:
+    """按优先级排队的出站帧，经令牌桶限速后交给写入任务.
+
+    高优先级的帧总是先于低优先级的帧发出；同一优先级内按提交顺序。
+    令牌桶限制整体发送速率，避免大量同步或轮询请求撑满网关的输入缓冲区。
+    """
+
+    def __init__(self, rate: float = SEND_RATE, burst: int = SEND_BURST) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._queues: list[deque[tuple[bytes, asyncio.Future[None], float]]] = [
+            deque() for _ in AcPriority
+        ]
+        self._stats = [_PriorityStats() for _ in AcPriority]
+
+    def put(
+        self, priority: AcPriority, message: bytes, future: asyncio.Future[None]
+    ) -> None:
+        queue = self._queues[priority]
+        queue.append((message, future, time.monotonic()))
+        stats = self._stats[priority]
+        stats.max_depth = max(stats.max_depth, len(queue))
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def delay(self) -> float:
+        """距离下一个令牌可用的秒数，0 表示现在就可以发送."""
+        self._refill(time.monotonic())
+        if self._tokens >= 1:
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+    def take(self, limit: int) -> list[tuple[bytes, asyncio.Future[None]]]:
+        """按优先级取出至多 limit 个帧，受可用令牌数限制."""
+        now = time.monotonic()
+        self._refill(now)
+        count = min(limit, int(self._tokens))
+        batch: list[tuple[bytes, asyncio.Future[None]]] = []
+        for queue, stats in zip(self._queues, self._stats, strict=True):
+            while queue and len(batch) < count:
+                message, future, queued = queue.popleft()
+                wait = now - queued
+                stats.sent += 1
+                stats.wait_total += wait
+                stats.wait_max = max(stats.wait_max, wait)
+                batch.append((message, future))
+        self._tokens -= len(batch)
+        return batch
+
+    def fail_all(self, exc: Exception) -> None:
+        """丢弃所有排队的帧."""
+        for queue in self._queues:
+            while queue:
+                _, future, _ = queue.popleft()
+                if not future.done():
+                    future.set_exception(exc)
+
+    def stats(self) -> dict[str, dict]:
+        """每个优先级的队列深度、已发送数量及排队等待时间（毫秒）."""
+        return {
+            priority.name.lower(): {
+                "queued": len(queue),
+                "max_queued": stats.max_depth,
+                "sent": stats.sent,
+                "wait_avg_ms": round(stats.wait_total / stats.sent * 1000, 2)
+                if stats.sent
+                else 0.0,
+                "wait_max_ms": round(stats.wait_max * 1000, 2),
+            }
+            for priority, queue, stats in zip(
+                AcPriority, self._queues, self._stats, strict=True
+            )
+        }
+
+    def __len__(self) -> int:
+        """排队中的帧数量."""
+        return sum(len(queue) for queue in self._queues)
@@ -0,0 +1,75 @@
+"""网关设备列表（ha/get report 中的 integrated_list）的解析与比对."""
+
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from .types import DeviceInfo, FloorInfo, GroupInfo, SceneInfo
+
+if TYPE_CHECKING:
+    from .unit import AcBaseUnit
+
+
+class AcTopology:
+    """按 ID 索引的设备、场景、群组信息及其所在区域."""
+
+    def __init__(self) -> None:
+        # device_id => (信息, 建议区域)
+        self.devices: dict[str, tuple[DeviceInfo, str | None]] = {}
+        # scene_id => (信息, "楼层 房间", 建议区域)
+        self.scenes: dict[int, tuple[SceneInfo, str, str | None]] = {}
+        # group_id => (信息, 建议区域)
+        self.groups: dict[int, tuple[GroupInfo, str | None]] = {}
+
+
+def parse_topology(raw_data: list[FloorInfo], area_name_rule: str) -> AcTopology:
+    """解析 integrated_list，area_name_rule 决定实体的建议区域."""
+    topology = AcTopology()
+    for floor_info in raw_data:
+        floor_name = floor_info["floor_name"]
+        for room_info in floor_info["rooms"]:
+            room_name = f"{floor_name} {room_info['name']}"
+            if area_name_rule == "floor_room":
+                suggested_area = room_name
+            elif area_name_rule == "room":
+                suggested_area = f"{room_info['name']}"
+            elif area_name_rule == "floor":
+                suggested_area = floor_name
+            else:
+                suggested_area = None
+            for device_info in room_info["devices"]:
+                topology.devices[device_info["device_id"]] = (
+                    device_info,
+                    suggested_area,
+                )
+            for scene_info in room_info["scenes"]:
+                topology.scenes[scene_info["scene_id"]] = (
+                    scene_info,
+                    room_name,
+                    suggested_area,
+                )
+            for group_info in room_info["groups"]:
+                topology.groups[group_info["group_id"]] = (group_info, suggested_area)
+    return topology
+
+
+class AcTopologyDiff:
+    """一次比对的结果，各项均为设备、场景或群组对象."""
+
+    def __init__(self) -> None:
+        self.added: list[AcBaseUnit] = []
+        self.removed: list[AcBaseUnit] = []
+        self.renamed: list[AcBaseUnit] = []
+        # 产品型号或群组类型改变，实体构成不同，无法原地更新
+        self.replaced: list[AcBaseUnit] = []
+
+    def __bool__(self) -> bool:
+        """是否有任何变化."""
+        return bool(self.added or self.removed or self.renamed or self.replaced)
+
+    def __repr__(self) -> str:
+        """Return a summary of the diff."""
+        return (
+            f"<AcTopologyDiff added:{len(self.added)} removed:{len(self.removed)} "
+            f"renamed:{len(self.renamed)} replaced:{len(self.replaced)}>"
+        )
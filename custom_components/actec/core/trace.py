@@ -0,0 +1,64 @@
+"""协议帧追踪."""
+
+from collections import deque
+from collections.abc import Callable
+import time
+
+TRACE_SIZE = 512
+
+TRACE_IN = "in"
+TRACE_OUT = "out"
+
+# 帧头摘要中保留的字段
+SUMMARY_KEYS = ("namespace", "command", "response", "type", "success")
+
+TraceConsumer = Callable[[str, bytes], None]
+
+
+class AcFrameTrace:
+    """最近收发帧的环形缓冲区.
+
+    始终开启：每帧只追加一个元组（方向、monotonic 时间、字节数、帧头引用）并累加计数，
+    不做任何格式化。只有挂载了消费者时才会复制原始帧数据。
+    """
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        self._frames: deque[tuple[str, float, int, dict]] = deque(maxlen=size)
+        self._consumers: list[TraceConsumer] = []
+        # 方向 => 累计帧数、字节数
+        self.frame_count = {TRACE_IN: 0, TRACE_OUT: 0}
+        self.byte_count = {TRACE_IN: 0, TRACE_OUT: 0}
+
+    @property
+    def has_consumers(self) -> bool:
+        return bool(self._consumers)
+
+    def record(self, direction: str, size: int, frame: list[dict] | dict) -> None:
+        head = frame[0] if isinstance(frame, list) and frame else frame
+        self._frames.append((direction, time.monotonic(), size, head))
+        self.frame_count[direction] += 1
+        self.byte_count[direction] += size
+
+    def emit(self, direction: str, raw: bytes) -> None:
+        """把原始帧交给消费者，调用前应先检查 has_consumers."""
+        for consumer in self._consumers:
+            consumer(direction, raw)
+
+    def add_consumer(self, consumer: TraceConsumer) -> Callable[[], None]:
+        self._consumers.append(consumer)
+        return lambda: self._consumers.remove(consumer)
+
+    def dump(self) -> list[dict]:
+        """导出缓冲区，time 为距现在的秒数（负数）."""
+        now = time.monotonic()
+        result = []
+        for direction, timestamp, size, head in self._frames:
+            entry = {
+                "direction": direction,
+                "time": round(timestamp - now, 3),
+                "size": size,
+            }
+            if isinstance(head, dict):
+                entry.update({key: head[key] for key in SUMMARY_KEYS if key in head})
+            result.append(entry)
+        return result
@@ -1,24 +1,82 @@
 from __future__ import annotations
 
-from collections.abc import Callable
-from typing import TYPE_CHECKING
+from collections.abc import Callable, Hashable
+import sys
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
     from .gateway import AcGateway
 
+# 监听者的键，设备的状态监听者以 endpoint 为键
+LISTEN_AVAILABLE = "available"
+LISTEN_INFO = "info"
+
+
+class AcListenerHandle:
+    """取消一次订阅，代替每次订阅创建的闭包."""
+
+    __slots__ = ("_key", "_listener", "_unit")
+
+    def __init__(
+        self, unit: AcBaseUnit, key: Hashable, listener: Callable[..., None]
+    ) -> None:
+        self._unit = unit
+        self._key = key
+        self._listener = listener
+
+    def __call__(self) -> None:
+        self._unit.remove_listener(self._key, self._listener)
+
 
 class AcBaseUnit:
+    """设备、场景、群组的基类.
+
+    单位数量可达上万，使用 __slots__，区域名等重复的字符串 intern 后共用一份。
+    监听者按键保存在一个字典中，值为元组：通知时直接遍历，增删时整体替换，
+    回调中取消订阅也不影响正在进行的遍历。
+    """
+
+    __slots__ = ("_listeners", "gateway", "suggested_area")
+
     def __init__(self, gateway: AcGateway, suggested_area: str | None) -> None:
         self.gateway = gateway
-        self.suggested_area = suggested_area
-        self._available_callbacks: set[Callable[[bool], None]] = set()
+        self.suggested_area = (
+            sys.intern(suggested_area) if suggested_area is not None else None
+        )
+        self._listeners: dict[Hashable, tuple[Callable[..., None], ...]] = {}
+
+    def add_listener_for(
+        self, key: Hashable, listener: Callable[..., Any]
+    ) -> AcListenerHandle:
+        """登记监听者，返回取消登记的可调用对象."""
+        self._listeners[key] = (*self._listeners.get(key, ()), listener)
+        return AcListenerHandle(self, key, listener)
+
+    def remove_listener(self, key: Hashable, listener: Callable[..., Any]) -> None:
+        listeners = list(self._listeners.get(key, ()))
+        if listener not in listeners:
+            return
+        listeners.remove(listener)
+        if listeners:
+            self._listeners[key] = tuple(listeners)
+        else:
+            del self._listeners[key]
 
     def add_available_listener(
         self, available_callback: Callable[[bool], None]
     ) -> Callable[[], None]:
-        self._available_callbacks.add(available_callback)
-        return lambda: self._available_callbacks.discard(available_callback)
+        return self.add_listener_for(LISTEN_AVAILABLE, available_callback)
 
     def set_available(self, available: bool) -> None:
-        for callback in self._available_callbacks:
+        for callback in self._listeners.get(LISTEN_AVAILABLE, ()):
             callback(available)
+
+    def add_info_listener(
+        self, info_callback: Callable[[], None]
+    ) -> Callable[[], None]:
+        """名称等信息在拓扑更新中被修改时回调."""
+        return self.add_listener_for(LISTEN_INFO, info_callback)
+
+    def notify_info_changed(self) -> None:
+        for callback in self._listeners.get(LISTEN_INFO, ()):
+            callback()
@@ -0,0 +1,113 @@
+"""连接存活检测."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+
+IDLE_TIMEOUT = 25.0  # 链路空闲这么久后发送心跳
+PING_INTERVAL = 25.0  # 持续空闲时两次心跳的间隔
+DEAD_TIMEOUT = 85.0  # 这么久没有收到任何数据，认为连接已断开
+RTT_SMOOTHING = 0.2  # 心跳往返时延指数平均的权重
+
+
+class AcLinkWatchdog:
+    """基于 loop.time() 和 call_at 定时器的连接存活检测.
+
+    收到数据时只记录时间，不重新设置定时器；定时器到期时按最后收到数据的时间
+    计算下一次检查的时刻。持续有上报时不会发送心跳，链路空闲 idle_timeout 后
+    每 ping_interval 发送一次，dead_timeout 内没有收到任何数据则调用 on_dead。
+    心跳应答的往返时延作为链路质量指标。
+    """
+
+    def __init__(
+        self,
+        send_ping: Callable[[], None],
+        on_dead: Callable[[], None],
+        *,
+        idle_timeout: float = IDLE_TIMEOUT,
+        ping_interval: float = PING_INTERVAL,
+        dead_timeout: float = DEAD_TIMEOUT,
+    ) -> None:
+        self._send_ping = send_ping
+        self._on_dead = on_dead
+        self.idle_timeout = idle_timeout
+        self.ping_interval = ping_interval
+        self.dead_timeout = dead_timeout
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._handle: asyncio.TimerHandle | None = None
+        self.last_received = 0.0
+        self._ping_sent: float | None = None  # 尚未应答的心跳的发送时间
+        self._last_ping = 0.0
+        self.pings = 0
+        self.ping_timeouts = 0  # 下一次心跳前仍未应答的心跳
+        self.rtt: float | None = None  # 最近一次心跳的往返时延（秒）
+        self.rtt_avg: float | None = None
+
+    def start(self) -> None:
+        """连接建立后开始检测."""
+        self.stop()
+        self._loop = loop = asyncio.get_running_loop()
+        self.last_received = loop.time()
+        self._ping_sent = None
+        self._schedule(self.last_received + self.idle_timeout)
+
+    def stop(self) -> None:
+        if handle := self._handle:
+            self._handle = None
+            handle.cancel()
+
+    def feed(self) -> None:
+        """收到数据."""
+        if loop := self._loop:
+            self.last_received = loop.time()
+
+    def on_pong(self) -> None:
+        """收到心跳应答."""
+        if (sent := self._ping_sent) is None or self._loop is None:
+            return
+        self._ping_sent = None
+        self.rtt = rtt = self._loop.time() - sent
+        self.rtt_avg = (
+            rtt
+            if self.rtt_avg is None
+            else self.rtt_avg + (rtt - self.rtt_avg) * RTT_SMOOTHING
+        )
+
+    def _schedule(self, when: float) -> None:
+        self._handle = self._loop.call_at(when, self._check)
+
+    def _check(self) -> None:
+        self._handle = None
+        now = self._loop.time()
+        idle = now - self.last_received
+        if idle >= self.dead_timeout:
+            self._on_dead()
+            return
+        if idle < self.idle_timeout:
+            self._schedule(self.last_received + self.idle_timeout)
+            return
+        if now - self._last_ping >= self.ping_interval:
+            if self._ping_sent is not None:
+                self.ping_timeouts += 1
+            self._ping_sent = self._last_ping = now
+            self.pings += 1
+            self._send_ping()
+        self._schedule(
+            min(
+                self._last_ping + self.ping_interval,
+                self.last_received + self.dead_timeout,
+            )
+        )
+
+    def stats(self) -> dict:
+        idle = self._loop.time() - self.last_received if self._loop else None
+        return {
+            "idle": round(idle, 1) if idle is not None else None,
+            "pings": self.pings,
+            "ping_timeouts": self.ping_timeouts,
+            "rtt_ms": round(self.rtt * 1000, 1) if self.rtt is not None else None,
+            "rtt_avg_ms": round(self.rtt_avg * 1000, 1)
+            if self.rtt_avg is not None
+            else None,
+        }
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 import logging
 from typing import Any
@@ -18,9 +20,14 @@ from homeassistant.helpers.typing import UndefinedType
 
 from . import AcConfigEntry
 from .core.const import ACTION_POSITION, KEY_PROPERTY, PROP_POSITION
-from .core.products import PRODUCTS_INFO
-from .core.types import GroupType, ProductMode
-from .entity import AcDeviceEntity, AcEntityDescription, AcGroupEntity
+from .core.types import GroupType
+from .entity import (
+    AcDeviceEntity,
+    AcEntityDescription,
+    AcGroupEntity,
+    AcUnits,
+    async_setup_units,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,37 +53,30 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC covers."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
 
-    gateway = config_entry.runtime_data
 
+def _build_entities(units: AcUnits) -> list[AcDeviceCover | AcGroupCover]:
+    """Create cover entities for the given units."""
     entities: list[AcDeviceCover | AcGroupCover] = []
 
-    for device in gateway.devices.values():
-        if device.product_key == "768":
-            if device.product_mode == ProductMode.CURTAIN:
-                entities.append(AcDeviceCover(device, 2, DESCRIPTIONS["curtain"]))
-            # else: ignore
-        elif device.product_key in PRODUCTS_INFO:
-            entities.extend(
-                [
-                    AcDeviceCover(device, info["endpoint"], DESCRIPTIONS[info["type"]])
-                    for info in PRODUCTS_INFO[device.product_key]
-                    if info["platform"] == Platform.COVER
-                    and info["type"] in DESCRIPTIONS
-                ]
-            )
-        else:
-            _LOGGER.debug("Unsupported device: %s", device)
+    entities.extend(
+        [
+            AcDeviceCover(device, endpoint, DESCRIPTIONS[type_])
+            for device, endpoint, type_ in units.device_capabilities(Platform.COVER)
+            if type_ in DESCRIPTIONS
+        ]
+    )
 
     entities.extend(
         [
             AcGroupCover(group, DESCRIPTIONS["curtain"])
-            for group in gateway.groups.values()
+            for group in units.groups
             if group.group_type == GroupType.CURTAIN
         ]
     )
 
-    async_add_entities(entities)
+    return entities
 
 
 class AcBaseCover(CoverEntity, RestoreEntity):
@@ -112,7 +112,7 @@ class AcDeviceCover(AcDeviceEntity, AcBaseCover):
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
-        await self.device.fetch_property(self.endpoint, ACTION_POSITION)
+        self.restore_property(ACTION_POSITION)
 
     def update_state(self, body: dict) -> None:
         """Update state."""
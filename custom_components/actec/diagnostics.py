@@ -0,0 +1,26 @@
+"""Diagnostics support for AcTEC."""
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from . import AcConfigEntry
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: AcConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    gateway = entry.runtime_data
+    return {
+        **gateway.stats(),
+        "listeners": {
+            device_id: device.listener_count
+            for device_id, device in gateway.devices.items()
+        },
+        "latency": {
+            f"{namespace}/{command}": histogram.as_dict()
+            for (namespace, command), histogram in gateway.latency.items()
+        },
+        "frames": gateway.trace.dump(),
+    }
@@ -1,14 +1,88 @@
-from dataclasses import dataclass
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
 
 from slugify import slugify
 
-from homeassistant.const import Platform
-from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.const import EntityCategory, Platform
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.device_registry import CONNECTION_NETWORK_MAC, DeviceInfo
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import Entity, EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN, MANUFACTURER
+from .const import DOMAIN, MANUFACTURER, SIGNAL_UNITS_ADDED
+from .core.capabilities import Capability, build_capability_index
 from .core.device import AcDevice
+from .core.gateway import AcGateway
 from .core.group import AcGroup
+from .core.scene import AcScene
+from .core.unit import AcBaseUnit
+
+if TYPE_CHECKING:
+    from . import AcConfigEntry
+
+
+@dataclass(frozen=True, kw_only=True)
+class AcUnits:
+    """Devices, scenes and groups to create entities for."""
+
+    devices: Sequence[AcDevice] = ()
+    scenes: Sequence[AcScene] = ()
+    groups: Sequence[AcGroup] = ()
+    # (device, endpoint, type) per platform, see core.capabilities
+    capabilities: Mapping[str, Sequence[Capability]] = field(default_factory=dict)
+
+    @classmethod
+    def from_units(cls, units: Iterable[AcBaseUnit]) -> AcUnits:
+        """Split a mixed list of units by kind."""
+        units = list(units)
+        devices = [unit for unit in units if isinstance(unit, AcDevice)]
+        return cls(
+            devices=devices,
+            scenes=[unit for unit in units if isinstance(unit, AcScene)],
+            groups=[unit for unit in units if isinstance(unit, AcGroup)],
+            capabilities=build_capability_index(devices),
+        )
+
+    def device_capabilities(self, platform: Platform) -> Sequence[Capability]:
+        """Return the device endpoints that belong to a platform."""
+        return self.capabilities.get(platform, ())
+
+
+def async_setup_units(
+    hass: HomeAssistant,
+    config_entry: AcConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    build_entities: Callable[[AcUnits], Sequence[Entity]],
+) -> None:
+    """Add entities for the gateway's units, and for units added later on."""
+    gateway = config_entry.runtime_data
+    async_add_entities(
+        build_entities(
+            AcUnits(
+                devices=list(gateway.devices.values()),
+                scenes=list(gateway.scenes.values()),
+                groups=list(gateway.groups.values()),
+                capabilities=gateway.capabilities,
+            )
+        )
+    )
+
+    @callback
+    def async_add_units(units: AcUnits) -> None:
+        if entities := build_entities(units):
+            async_add_entities(entities)
+
+    config_entry.async_on_unload(
+        async_dispatcher_connect(
+            hass,
+            SIGNAL_UNITS_ADDED.format(config_entry.entry_id),
+            async_add_units,
+        )
+    )
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -55,6 +129,13 @@ class AcDeviceEntity(Entity):
     def update_state(self, body: dict) -> None:
         """Update state."""
 
+    def restore_property(self, action: str) -> None:
+        """Seed state from the device cache, or queue a sync from the gateway."""
+        if (body := self.device.get_cached(self.endpoint, action)) is not None:
+            self.update_state(body)
+        else:
+            self.device.sync_property(self.endpoint, action)
+
     def set_available(self, available: bool) -> None:
         self._attr_available = available
         self.async_write_ha_state()
@@ -87,3 +168,22 @@ class AcGroupEntity(Entity):
     def set_available(self, available: bool) -> None:
         self._attr_available = available
         self.async_write_ha_state()
+
+
+class AcGatewayEntity(Entity):
+    """Base class for the gateway's own diagnostic entities."""
+
+    entity_description: AcEntityDescription
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(self, gateway: AcGateway, description: AcEntityDescription) -> None:
+        self.gateway = gateway
+        self.entity_description = description
+        self._attr_device_info = DeviceInfo(
+            identifiers={(DOMAIN, gateway.unique_id)},
+            connections={(CONNECTION_NETWORK_MAC, gateway.mac)},
+            manufacturer=MANUFACTURER,
+            translation_key="gateway",
+        )
+        self._attr_unique_id = f"{DOMAIN}_{gateway.unique_id}_{description.key}"
+        self.entity_id = f"{description.PLATFORM}.{self.unique_id}"
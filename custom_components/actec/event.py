@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from enum import IntEnum
 import logging
@@ -13,8 +15,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from . import AcConfigEntry
 from .core.const import KEY_PROPERTY, PROP_KEY_EVENT
-from .core.products import PRODUCTS_INFO
-from .entity import AcDeviceEntity, AcEntityDescription
+from .entity import AcDeviceEntity, AcEntityDescription, AcUnits, async_setup_units
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -76,24 +77,17 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC events."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
 
-    gateway = config_entry.runtime_data
-
-    entities: list[AcKeyEvent] = []
-
-    for device in gateway.devices.values():
-        if device.product_key in PRODUCTS_INFO:
-            for info in PRODUCTS_INFO[device.product_key]:
-                if info["platform"] == Platform.EVENT and info["type"] in DESCRIPTIONS:
-                    endpoint = info["endpoint"]
-                    entities.extend(
-                        [
-                            AcKeyEvent(device, endpoint, desc)
-                            for desc in DESCRIPTIONS[info["type"]]
-                        ]
-                    )
 
-    async_add_entities(entities)
+def _build_entities(units: AcUnits) -> list[AcKeyEvent]:
+    """Create key event entities for the given units."""
+    return [
+        AcKeyEvent(device, endpoint, desc)
+        for device, endpoint, type_ in units.device_capabilities(Platform.EVENT)
+        if type_ in DESCRIPTIONS
+        for desc in DESCRIPTIONS[type_]
+    ]
 
 
 class AcKeyEvent(AcDeviceEntity, EventEntity):
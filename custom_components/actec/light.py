@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from abc import abstractmethod
 from dataclasses import dataclass
 import logging
@@ -34,10 +36,16 @@ from .core.const import (
     PROP_V,
 )
 from .core.device import AcDevice
+from .core.exceptions import CommandDropped
 from .core.group import AcGroup
-from .core.products import PRODUCTS_INFO
-from .core.types import GroupType, ProductMode
-from .entity import AcDeviceEntity, AcEntityDescription, AcGroupEntity
+from .core.types import GroupType
+from .entity import (
+    AcDeviceEntity,
+    AcEntityDescription,
+    AcGroupEntity,
+    AcUnits,
+    async_setup_units,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -81,63 +89,31 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC lights."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
 
-    gateway = config_entry.runtime_data
 
+def _build_entities(units: AcUnits) -> list[AcDeviceLight | AcGroupLight]:
+    """Create light entities for the given units."""
     entities: list[AcDeviceLight | AcGroupLight] = []
 
-    for device in gateway.devices.values():
-        if device.product_key == "5120":
-            if device.product_mode == ProductMode.BRIGHTNESS:
-                color_modes = COLOR_MODES["brightness"]
-                entities.append(AcDeviceLight(device, 2, color_modes))
-                entities.append(AcDeviceLight(device, 3, color_modes))
-            elif device.product_mode == ProductMode.COLOR_TEMP:
-                color_modes = COLOR_MODES["color_temp"]
-                entities.append(AcDeviceLight(device, 2, color_modes))
-            else:
-                _LOGGER.debug("Unsupported product_mode: %s", device)
-        elif device.product_key == "5121":
-            if device.product_mode == ProductMode.BRIGHTNESS:
-                color_modes = COLOR_MODES["brightness"]
-                entities.append(AcDeviceLight(device, 2, color_modes))
-                entities.append(AcDeviceLight(device, 3, color_modes))
-                entities.append(AcDeviceLight(device, 4, color_modes))
-                entities.append(AcDeviceLight(device, 5, color_modes))
-                entities.append(AcDeviceLight(device, 6, color_modes))
-                entities.append(AcDeviceLight(device, 7, color_modes))
-                entities.append(AcDeviceLight(device, 8, color_modes))
-                entities.append(AcDeviceLight(device, 9, color_modes))
-            elif device.product_mode == ProductMode.COLOR_TEMP:
-                color_modes = COLOR_MODES["color_temp"]
-                entities.append(AcDeviceLight(device, 2, color_modes))
-                entities.append(AcDeviceLight(device, 4, color_modes))
-                entities.append(AcDeviceLight(device, 6, color_modes))
-                entities.append(AcDeviceLight(device, 8, color_modes))
-            else:
-                _LOGGER.debug("Unsupported product_mode: %s", device)
-        elif device.product_key in PRODUCTS_INFO:
-            entities.extend(
-                [
-                    AcDeviceLight(device, info["endpoint"], COLOR_MODES[info["type"]])
-                    for info in PRODUCTS_INFO[device.product_key]
-                    if info["platform"] == Platform.LIGHT
-                    and info["type"] in COLOR_MODES
-                ]
-            )
-        else:
-            _LOGGER.debug("Unsupported device: %s", device)
+    entities.extend(
+        [
+            AcDeviceLight(device, endpoint, COLOR_MODES[type_])
+            for device, endpoint, type_ in units.device_capabilities(Platform.LIGHT)
+            if type_ in COLOR_MODES
+        ]
+    )
 
     entities.extend(
         [
             AcGroupLight(group, group_type_to_color_modes(group.group_type))
-            for group in gateway.groups.values()
+            for group in units.groups
             if group.group_type
             in [GroupType.BRIGHTNESS, GroupType.COLOR_TEMP, GroupType.RGB_COLOR_TEMP]
         ]
     )
 
-    async_add_entities(entities)
+    return entities
 
 
 class AcBaseLight(LightEntity, RestoreEntity):
@@ -202,6 +178,13 @@ class AcBaseLight(LightEntity, RestoreEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         _LOGGER.debug("async_turn_on: %s", kwargs)
+        try:
+            await self._async_turn_on(**kwargs)
+        except CommandDropped:
+            # Turned off before the value was sent, keep the state reported for that
+            _LOGGER.debug("async_turn_on dropped: %s", kwargs)
+
+    async def _async_turn_on(self, **kwargs: Any) -> None:
         if len(kwargs.keys()) == 0:
             await self.device_set_onoff(True)
             self._attr_is_on = True
@@ -266,7 +249,7 @@ class AcDeviceLight(AcDeviceEntity, AcBaseLight):
         if ColorMode.HS in self.supported_color_modes:
             actions.add(ACTION_HSV)
         for action in actions:
-            await self.device.fetch_property(self.endpoint, action)
+            self.restore_property(action)
 
     def update_state(self, body: dict) -> None:
         """Update state."""
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from collections.abc import Callable
 from dataclasses import dataclass
 from datetime import date, datetime, timedelta
@@ -7,10 +9,17 @@ import logging
 from homeassistant.components.sensor import (
     RestoreSensor,
     SensorDeviceClass,
+    SensorEntity,
     SensorEntityDescription,
     SensorStateClass,
 )
-from homeassistant.const import LIGHT_LUX, Platform, UnitOfEnergy, UnitOfPower
+from homeassistant.const import (
+    LIGHT_LUX,
+    Platform,
+    UnitOfEnergy,
+    UnitOfPower,
+    UnitOfTime,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import StateType
@@ -25,8 +34,15 @@ from .core.const import (
     PROP_POWER,
     PROP_TOTAL_ENERGY,
 )
-from .core.products import PRODUCTS_INFO
-from .entity import AcDeviceEntity, AcEntityDescription
+from .core.gateway import AcGateway
+from .core.latency import AcLatencyHistogram
+from .entity import (
+    AcDeviceEntity,
+    AcEntityDescription,
+    AcGatewayEntity,
+    AcUnits,
+    async_setup_units,
+)
 
 SCAN_INTERVAL = timedelta(minutes=1)
 
@@ -81,35 +97,82 @@ DESCRIPTIONS = {
 }
 
 
+@dataclass(frozen=True, kw_only=True)
+class AcGatewaySensorDescription(AcEntityDescription, SensorEntityDescription):
+    """Describes the gateway's millisecond timing sensors."""
+
+    PLATFORM: Platform = Platform.SENSOR
+    device_class: SensorDeviceClass = SensorDeviceClass.DURATION
+    native_unit_of_measurement: str = UnitOfTime.MILLISECONDS
+    state_class: SensorStateClass = SensorStateClass.MEASUREMENT
+    suggested_display_precision: int = 0
+
+
+@dataclass(frozen=True, kw_only=True)
+class AcLatencySensorDescription(AcGatewaySensorDescription):
+    """Describes the gateway's round-trip latency sensors."""
+
+    request: tuple[str, str]
+
+
+LATENCY_DESCRIPTIONS = (
+    AcLatencySensorDescription(
+        key="device_set_latency",
+        translation_key="device_set_latency",
+        request=("device_control", "set"),
+    ),
+    AcLatencySensorDescription(
+        key="device_get_latency",
+        translation_key="device_get_latency",
+        request=("device_control", "get"),
+    ),
+    AcLatencySensorDescription(
+        key="group_set_latency",
+        translation_key="group_set_latency",
+        request=("group_control", "set"),
+    ),
+    AcLatencySensorDescription(
+        key="scene_trigger_latency",
+        translation_key="scene_trigger_latency",
+        request=("scene_control", "trigger"),
+    ),
+)
+
+
+PING_RTT_DESCRIPTION = AcGatewaySensorDescription(
+    key="ping_rtt",
+    translation_key="ping_rtt",
+)
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: AcConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC sensors."""
-
     gateway = config_entry.runtime_data
-
-    entities: list[AcDeviceSensor] = []
-
-    for device in gateway.devices.values():
-        if device.product_key in PRODUCTS_INFO:
-            for info in PRODUCTS_INFO[device.product_key]:
-                if info["platform"] == Platform.SENSOR and info["type"] in DESCRIPTIONS:
-                    if info["type"] == "energy":
-                        entities.append(
-                            AcEnergySensor(
-                                device, info["endpoint"], DESCRIPTIONS[info["type"]]
-                            )
-                        )
-                    else:
-                        entities.append(
-                            AcDeviceSensor(
-                                device, info["endpoint"], DESCRIPTIONS[info["type"]]
-                            )
-                        )
-
-    async_add_entities(entities)
+    async_add_entities(
+        [
+            *(
+                AcLatencySensor(gateway, description)
+                for description in LATENCY_DESCRIPTIONS
+            ),
+            AcPingSensor(gateway, PING_RTT_DESCRIPTION),
+        ]
+    )
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
+
+
+def _build_entities(units: AcUnits) -> list[AcDeviceSensor]:
+    """Create sensor entities for the given units."""
+    return [
+        (AcEnergySensor if type_ == "energy" else AcDeviceSensor)(
+            device, endpoint, DESCRIPTIONS[type_]
+        )
+        for device, endpoint, type_ in units.device_capabilities(Platform.SENSOR)
+        if type_ in DESCRIPTIONS
+    ]
 
 
 class AcDeviceSensor(AcDeviceEntity, RestoreSensor):
@@ -122,21 +185,70 @@ class AcDeviceSensor(AcDeviceEntity, RestoreSensor):
         await super().async_added_to_hass()
         if last_state := await self.async_get_last_sensor_data():
             self._attr_native_value = last_state.native_value
-        await self.device.fetch_property(self.endpoint, self.entity_description.action)
+        self.restore_property(self.entity_description.action)
 
     def update_state(self, body: dict) -> None:
         """Update state."""
         prop = body.get(KEY_PROPERTY, {})
         value = prop.get(self.entity_description.prop)
         if value is not None:
-            self._attr_native_value = self.entity_description.value_fn(value)
+            native_value = self.entity_description.value_fn(value)
+            if native_value != self._attr_native_value:
+                self._attr_native_value = native_value
+                self.async_write_ha_state()
 
 
 class AcEnergySensor(AcDeviceSensor):
-    """Representation of a Sensor for energy."""
+    """Representation of a Sensor for energy, polled by the gateway's poller."""
+
+    async def async_added_to_hass(self) -> None:
+        """Run when entity about to be added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.device.poll_property(self.endpoint, self.entity_description.action)
+        )
+
+
+class AcLatencySensor(AcGatewayEntity, SensorEntity):
+    """p95 round-trip latency of one request type, from frame write to ack."""
+
+    entity_description: AcLatencySensorDescription
+
+    _attr_should_poll = True
+
+    def __init__(
+        self, gateway: AcGateway, description: AcLatencySensorDescription
+    ) -> None:
+        super().__init__(gateway, description)
+        self._histogram: AcLatencyHistogram = gateway.latency[description.request]
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 95th percentile in milliseconds."""
+        return self._histogram.percentile(0.95)
+
+    @property
+    def extra_state_attributes(self) -> dict:
+        """Return the other percentiles and counters."""
+        histogram = self._histogram
+        return {
+            "p50": histogram.percentile(0.5),
+            "p99": histogram.percentile(0.99),
+            "count": histogram.count,
+            "timeouts": histogram.timeouts,
+        }
+
+
+class AcPingSensor(AcGatewayEntity, SensorEntity):
+    """Smoothed heartbeat round-trip time, sent only while the link is idle."""
+
+    entity_description: AcGatewaySensorDescription
 
     _attr_should_poll = True
 
-    async def async_update(self) -> None:
-        """Get the latest energy usage."""
-        await self.device.fetch_property(self.endpoint, self.entity_description.action)
+    @property
+    def native_value(self) -> float | None:
+        """Return the average ping RTT in milliseconds."""
+        if (rtt := self.gateway.ping_rtt) is None:
+            return None
+        return round(rtt * 1000, 1)
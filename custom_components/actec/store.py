@@ -0,0 +1,50 @@
+"""Persistent cache of the gateway topology."""
+
+import hashlib
+import json
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+from .core.types import FloorInfo
+
+STORAGE_VERSION = 1
+
+
+def topology_hash(integrated_list: list[FloorInfo]) -> str:
+    """Return a content hash of the gateway's integrated_list."""
+    content = json.dumps(integrated_list, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class AcTopologyStore:
+    """The last good integrated_list reported by the gateway, keyed by entry."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        self._store: Store[dict] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.topology"
+        )
+        self.hash: str | None = None
+
+    async def async_load(self) -> list[FloorInfo] | None:
+        """Load the cached topology, None if nothing was cached yet."""
+        if not (data := await self._store.async_load()):
+            return None
+        self.hash = data.get("hash")
+        return data.get("integrated_list")
+
+    async def async_save(self, integrated_list: list[FloorInfo]) -> bool:
+        """Save the topology, return False if it did not change."""
+        content_hash = topology_hash(integrated_list)
+        if content_hash == self.hash:
+            return False
+        self.hash = content_hash
+        await self._store.async_save(
+            {"hash": content_hash, "integrated_list": integrated_list}
+        )
+        return True
+
+    async def async_remove(self) -> None:
+        """Remove the cache, the next setup then reads the topology from the gateway."""
+        await self._store.async_remove()
@@ -1,3 +1,5 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 import logging
 from typing import Any
@@ -15,9 +17,14 @@ from homeassistant.helpers.typing import UndefinedType
 
 from . import AcConfigEntry
 from .core.const import ACTION_ONOFF, KEY_PROPERTY, PROP_ONOFF
-from .core.products import PRODUCTS_INFO
-from .core.types import GroupType, ProductMode
-from .entity import AcDeviceEntity, AcEntityDescription, AcGroupEntity
+from .core.types import GroupType
+from .entity import (
+    AcDeviceEntity,
+    AcEntityDescription,
+    AcGroupEntity,
+    AcUnits,
+    async_setup_units,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -42,38 +49,30 @@ async def async_setup_entry(
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up AcTEC switches."""
+    async_setup_units(hass, config_entry, async_add_entities, _build_entities)
 
-    gateway = config_entry.runtime_data
 
+def _build_entities(units: AcUnits) -> list[AcDeviceSwitch | AcGroupSwitch]:
+    """Create switch entities for the given units."""
     entities: list[AcDeviceSwitch | AcGroupSwitch] = []
 
-    for device in gateway.devices.values():
-        if device.product_key == "768":
-            if device.product_mode == ProductMode.ON_OFF:
-                entities.append(AcDeviceSwitch(device, 2, DESCRIPTIONS["switch"]))
-                entities.append(AcDeviceSwitch(device, 3, DESCRIPTIONS["switch"]))
-            # else: ignore
-        elif device.product_key in PRODUCTS_INFO:
-            entities.extend(
-                [
-                    AcDeviceSwitch(device, info["endpoint"], DESCRIPTIONS[info["type"]])
-                    for info in PRODUCTS_INFO[device.product_key]
-                    if info["platform"] == Platform.SWITCH
-                    and info["type"] in DESCRIPTIONS
-                ]
-            )
-        else:
-            _LOGGER.debug("Unsupported device: %s", device)
+    entities.extend(
+        [
+            AcDeviceSwitch(device, endpoint, DESCRIPTIONS[type_])
+            for device, endpoint, type_ in units.device_capabilities(Platform.SWITCH)
+            if type_ in DESCRIPTIONS
+        ]
+    )
 
     entities.extend(
         [
             AcGroupSwitch(group, DESCRIPTIONS["switch"])
-            for group in gateway.groups.values()
+            for group in units.groups
             if group.group_type == GroupType.ON_OFF
         ]
     )
 
-    async_add_entities(entities)
+    return entities
 
 
 class AcBaseSwitch(SwitchEntity, RestoreEntity):
@@ -97,7 +96,7 @@ class AcDeviceSwitch(AcDeviceEntity, AcBaseSwitch):
     async def async_added_to_hass(self) -> None:
         """Run when entity about to be added to hass."""
         await super().async_added_to_hass()
-        await self.device.fetch_property(self.endpoint, ACTION_ONOFF)
+        self.restore_property(ACTION_ONOFF)
 
     def update_state(self, body: dict) -> None:
         """Update state."""
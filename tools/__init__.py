@@ -0,0 +1 @@
+"""Development tools that run without Home Assistant."""
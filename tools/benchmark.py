@@ -0,0 +1,442 @@
+"""core 中协议与消息分发热点路径的基准测试.
+
+不依赖 Home Assistant，结果以 JSON 输出，便于比较不同版本:
+
+    python tools/benchmark.py --output before.json
+    python tools/benchmark.py --output after.json --compare before.json
+
+测试项:
+    frame_decode  解帧吞吐量（合成数据，或 --capture 指定的原始抓包）
+    dispatch      _handle_message 分发吞吐量，每个设备端点都注册了监听者
+    encode        出站命令编码耗时（命令模板 / 通用编码）
+    init_devices  解析 10 ~ 10000 个设备的 integrated_list 的耗时
+    setup         5000 个混合型号设备的站点，各平台挑选要创建实体的端点的耗时
+    memory        1000 / 10000 个设备时每个设备占用的内存（tracemalloc）
+    e2e           经模拟网关从发出命令到收到应答的时延
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import contextlib
+import gc
+import json
+import logging
+from pathlib import Path
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components/actec"))
+
+from core.capabilities import build_capability_index, product_capabilities
+from core.client import READ_CHUNK_SIZE, AcTransportMode
+from core.command import DEVICE_SET, PRECOMPILED
+from core.frame import JSON_BACKEND, AcFrameDecoder, encode_frame, frame_prefix
+from core.gateway import AcGateway
+from core.types import ProductMode
+
+from tools.simulator import AcGatewaySimulator, synthetic_topology
+
+MAC = "aa:bb:cc:dd:ee:ff"
+TOKEN = "112233445566"
+REPEAT = 5  # 每项取 REPEAT 次中最快的一次
+INIT_SIZES = (10, 100, 1000, 10000)
+SETUP_DEVICES = 5000
+# 混合站点中循环使用的型号，包括按 product_mode 区分的产品
+SETUP_PRODUCTS = (
+    ("16", None),
+    ("17", None),
+    ("20", None),
+    ("4100", None),
+    ("4352", None),
+    ("4608", None),
+    ("4865", None),
+    ("768", ProductMode.ON_OFF),
+    ("768", ProductMode.CURTAIN),
+    ("5120", ProductMode.BRIGHTNESS),
+    ("5121", ProductMode.COLOR_TEMP),
+    ("27", None),
+)
+MEMORY_SIZES = (1000, 10000)
+SETUP_PLATFORMS = ("light", "switch", "cover", "sensor", "binary_sensor", "event")
+
+
+def best_of(func: Callable[[], object], number: int, repeat: int = REPEAT) -> float:
+    """执行 number 次 func，重复 repeat 次，返回最快一次的平均单次耗时（秒）."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        best = min(best, (time.perf_counter() - start) / number)
+    return best
+
+
+def synthetic_capture(frames: int) -> bytes:
+    """与网关实际下行数据相近的帧序列：属性上报为主，夹杂设置应答和心跳."""
+    prefix = frame_prefix(MAC.replace(":", ""))
+    chunks = []
+    for index in range(frames):
+        device_id = f"sim{index % 1000:06d}"
+        if index % 10 == 0:
+            frame = [
+                {"namespace": "device_control", "response": "set", "success": True},
+                {"device_id": device_id, "endpoint": 2, "action": "level"},
+            ]
+        elif index % 100 == 1:
+            frame = [{"namespace": "system", "response": "ping", "success": True}, {}]
+        else:
+            frame = AcGatewaySimulator.property_report(
+                device_id, 2, "level", {"level": index % 256}
+            )
+        chunks.append(encode_frame(prefix, frame))
+    return b"".join(chunks)
+
+
+def bench_frame_decode(capture: bytes | None, quick: bool) -> dict:
+    """按 READ_CHUNK_SIZE 分块解帧，与从套接字读取时相同."""
+    data = (
+        capture if capture is not None else synthetic_capture(2000 if quick else 20000)
+    )
+    chunks = [
+        data[offset : offset + READ_CHUNK_SIZE]
+        for offset in range(0, len(data), READ_CHUNK_SIZE)
+    ]
+    frames = sum(len(frames) for frames in map(AcFrameDecoder().feed, chunks))
+
+    def decode() -> None:
+        decoder = AcFrameDecoder()
+        for chunk in chunks:
+            decoder.feed(chunk)
+
+    seconds = best_of(decode, 1 if quick else 3)
+    return {
+        "source": "capture" if capture is not None else "synthetic",
+        "frames": frames,
+        "bytes": len(data),
+        "frames_per_s": round(frames / seconds),
+        "mb_per_s": round(len(data) / seconds / 1e6, 1),
+    }
+
+
+def bench_dispatch(quick: bool) -> dict:
+    """属性上报从 _handle_message 到实体回调的完整路径."""
+    devices = 400 if quick else 4000
+    gateway = AcGateway("127.0.0.1:1", MAC, TOKEN)
+    gateway.init_devices(synthetic_topology(devices), "room")
+    for device in gateway.devices.values():
+        device.add_listener(2, lambda body: None)
+        device.add_available_listener(lambda available: None)
+    head = {"namespace": "device_control", "type": "device_property"}
+    # 值依次变化，每条都会通知到实体，不会被去重
+    messages = [
+        {
+            "device_id": f"sim{index % devices:06d}",
+            "endpoint": 2,
+            "action": "level",
+            "property": {"level": index // devices % 256},
+        }
+        for index in range(devices * 25)
+    ]
+    handle = gateway._handle_message  # noqa: SLF001
+
+    def dispatch() -> None:
+        for body in messages:
+            handle(head, body)
+
+    seconds = best_of(dispatch, 1)
+    return {
+        "devices": devices,
+        "listeners": devices * 2,
+        "messages": len(messages),
+        "suppressed": gateway.reports_suppressed,  # 应为 0
+        "messages_per_s": round(len(messages) / seconds),
+        "us_per_message": round(seconds / len(messages) * 1e6, 3),
+    }
+
+
+def bench_encode(quick: bool) -> dict:
+    """编码一条设备亮度设置，通用编码直接用 encode_frame，同样包含构造 body 的开销.
+
+    网关只用模板编码，模板只在标准库 json 下预编译.
+    """
+    gateway = AcGateway("127.0.0.1:1", MAC, TOKEN)
+    client = gateway._client  # noqa: SLF001
+    number = 2000 if quick else 20000
+
+    def generic() -> bytes:
+        body = {
+            "device_id": "sim000001",
+            "endpoint": 2,
+            "action": "level",
+            "property": {"level": 128},
+        }
+        return client.encode_command([DEVICE_SET.head, body])
+
+    def templated() -> bytes:
+        return client.encode_template(
+            DEVICE_SET, "sim000001", 2, "level", {"level": 128}
+        )
+
+    return {
+        "json_backend": JSON_BACKEND,
+        "precompiled": PRECOMPILED,
+        "template_us": round(best_of(templated, number) * 1e6, 3),
+        "generic_us": round(best_of(generic, number) * 1e6, 3),
+    }
+
+
+def bench_init_devices(quick: bool) -> dict:
+    """解析设备列表并创建设备、场景、群组对象，单位毫秒."""
+    results = {}
+    for size in INIT_SIZES if not quick else INIT_SIZES[:3]:
+        raw_data = synthetic_topology(size)
+
+        def init(raw_data=raw_data) -> None:
+            AcGateway("127.0.0.1:1", MAC, TOKEN).init_devices(raw_data, "room")
+
+        results[str(size)] = round(best_of(init, 1) * 1000, 3)
+    return {"ms": results}
+
+
+def bench_setup(quick: bool) -> dict:
+    """各平台 async_setup_entry 中挑选设备端点的部分，单位毫秒.
+
+    scan 为每个平台各自遍历全部设备并查产品表，index 为 init_devices 时建好
+    按平台的索引、各平台只遍历自己的部分。实体对象的创建依赖 Home Assistant，不计入。
+    """
+    devices = SETUP_DEVICES // 10 if quick else SETUP_DEVICES
+    raw_data = synthetic_topology(devices)
+    for floor in raw_data:
+        for room in floor["rooms"]:
+            for index, device in enumerate(room["devices"]):
+                product_key, product_mode = SETUP_PRODUCTS[index % len(SETUP_PRODUCTS)]
+                device["product_key"] = product_key
+                device["product_mode"] = product_mode
+    gateway = AcGateway("127.0.0.1:1", MAC, TOKEN)
+    gateway.init_devices(raw_data, "room")
+    units = list(gateway.devices.values())
+
+    def scan() -> list:
+        return [
+            [
+                (device, info["endpoint"], info["type"])
+                for device in units
+                for info in product_capabilities(
+                    device.product_key, device.product_mode
+                )
+                or ()
+                if info["platform"] == platform
+            ]
+            for platform in SETUP_PLATFORMS
+        ]
+
+    def index() -> list:
+        capabilities = build_capability_index(units)
+        return [list(capabilities.get(platform, ())) for platform in SETUP_PLATFORMS]
+
+    assert scan() == index()
+    return {
+        "devices": devices,
+        "endpoints": {
+            platform: len(gateway.capabilities.get(platform, ()))
+            for platform in SETUP_PLATFORMS
+        },
+        "scan_ms": round(best_of(scan, 1) * 1000, 3),
+        "index_ms": round(best_of(index, 1) * 1000, 3),
+        "build_index_ms": round(
+            best_of(lambda: build_capability_index(units), 1) * 1000, 3
+        ),
+    }
+
+
+class _Entity:
+    """模拟实体：每个设备订阅一个端点的状态、可用性和信息变化."""
+
+    def update_state(self, body: dict) -> None:
+        pass
+
+    def set_available(self, available: bool) -> None:
+        pass
+
+    def update_info(self) -> None:
+        pass
+
+
+def _traced(func: Callable[[], object]) -> tuple[object, int]:
+    """执行 func，返回其结果及执行后仍被占用的内存字节数."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        gc.collect()
+        return result, tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def bench_memory(quick: bool) -> dict:
+    """解析设备列表后常驻的内存（含场景、群组及索引）和订阅所占内存，按设备数平均.
+
+    与连接网关时一样，在测量范围内解析 JSON 并在之后释放，设备对象引用的字符串计入。
+    """
+    results = {}
+    for size in MEMORY_SIZES[:1] if quick else MEMORY_SIZES:
+        payload = json.dumps(synthetic_topology(size))
+        gateway = AcGateway("127.0.0.1:1", MAC, TOKEN)
+        _, units = _traced(
+            lambda gateway=gateway, payload=payload: gateway.init_devices(
+                json.loads(payload), "room"
+            )
+        )
+        entities = [_Entity() for _ in range(size)]
+
+        def subscribe(entities=entities, gateway=gateway) -> list:
+            return [
+                (
+                    device.add_listener(2, entity.update_state),
+                    device.add_available_listener(entity.set_available),
+                    device.add_info_listener(entity.update_info),
+                )
+                for device, entity in zip(
+                    gateway.devices.values(), entities, strict=True
+                )
+            ]
+
+        unsubscribes, listeners = _traced(subscribe)
+        results[str(size)] = {
+            "units_bytes_per_device": round(units / size),
+            "listeners_bytes_per_device": round(listeners / size),
+        }
+        del unsubscribes
+    return results
+
+
+async def _e2e(mode: AcTransportMode, commands: int) -> dict:
+    simulator = AcGatewaySimulator(synthetic_topology(200))
+    port = await simulator.start()
+    # 测量协议栈本身的时延，不受发送限速影响
+    gateway = AcGateway(
+        f"127.0.0.1:{port}", MAC, TOKEN, mode, send_rate=1e9, send_burst=10**9
+    )
+    try:
+        await gateway.connect()
+        response = await gateway.get_ha_report()
+        gateway.init_devices(response[1]["integrated_list"], "room")
+        main = asyncio.create_task(gateway.start_main_loop())
+        samples = []
+        for index in range(commands):
+            start = time.perf_counter()
+            await gateway.set_device_property(
+                f"sim{index % 200:06d}", 2, "level", {"level": index % 256}
+            )
+            samples.append((time.perf_counter() - start) * 1000)
+        start = time.perf_counter()
+        await asyncio.gather(
+            *(
+                gateway.set_device_property(
+                    f"sim{index % 200:06d}", 2, "level", {"level": index % 256}
+                )
+                for index in range(commands)
+            )
+        )
+        concurrent = time.perf_counter() - start
+        main.cancel()
+    finally:
+        await gateway.close()
+        await simulator.stop()
+    percentiles = statistics.quantiles(samples, n=100)
+    return {
+        "commands": commands,
+        "p50_ms": round(percentiles[49], 3),
+        "p95_ms": round(percentiles[94], 3),
+        "p99_ms": round(percentiles[98], 3),
+        "avg_ms": round(statistics.fmean(samples), 3),
+        "concurrent_per_s": round(commands / concurrent),
+    }
+
+
+def bench_e2e(quick: bool) -> dict:
+    """依次发送的单条命令时延，及同时发送时的吞吐量，两种传输模式各测一次."""
+    commands = 200 if quick else 2000
+    return {
+        mode.name.lower(): asyncio.run(_e2e(mode, commands)) for mode in AcTransportMode
+    }
+
+
+BENCHMARKS = {
+    "frame_decode": lambda args: bench_frame_decode(args.capture_data, args.quick),
+    "dispatch": lambda args: bench_dispatch(args.quick),
+    "encode": lambda args: bench_encode(args.quick),
+    "init_devices": lambda args: bench_init_devices(args.quick),
+    "setup": lambda args: bench_setup(args.quick),
+    "memory": lambda args: bench_memory(args.quick),
+    "e2e": lambda args: bench_e2e(args.quick),
+}
+
+
+def _flatten(data: dict, prefix: str = "") -> dict[str, float]:
+    flat = {}
+    for key, value in data.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(_flatten(value, f"{name}."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(baseline: dict, results: dict) -> None:
+    """打印与基准结果相比的变化（新值 / 旧值）."""
+    old = _flatten(baseline["results"])
+    for name, value in _flatten(results["results"]).items():
+        if old.get(name):
+            print(f"{name:45} {old[name]:>14} -> {value:>14}  x{value / old[name]:.2f}")  # noqa: T201
+
+
+def main() -> None:
+    """Run the benchmarks and print or write the JSON results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--only", nargs="+", choices=BENCHMARKS, help="只运行这些测试项"
+    )
+    parser.add_argument("--quick", action="store_true", help="减少数据量，快速检查")
+    parser.add_argument("--capture", type=Path, help="原始下行数据，用于解帧测试")
+    parser.add_argument("--output", type=Path, help="结果写入文件，默认输出到标准输出")
+    parser.add_argument("--compare", type=Path, help="与之前的结果文件比较")
+    args = parser.parse_args()
+    args.capture_data = args.capture.read_bytes() if args.capture else None
+    logging.basicConfig(level=logging.WARNING)
+
+    results: dict = {
+        "meta": {
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "machine": platform.machine(),
+            "json_backend": JSON_BACKEND,
+            "quick": args.quick,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        },
+        "results": {},
+    }
+    for name in args.only or BENCHMARKS:
+        results["results"][name] = BENCHMARKS[name](args)
+
+    content = json.dumps(results, indent=2, ensure_ascii=False)
+    if args.output:
+        args.output.write_text(content + "\n")
+    else:
+        print(content)  # noqa: T201
+    if args.compare:
+        with contextlib.suppress(FileNotFoundError):
+            compare(json.loads(args.compare.read_text()), results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,452 @@
+"""本地 AcTEC 网关模拟器.
+
+在本机监听 TCP 端口，实现与真实网关相同的协议：login: 提示和密码、
+[AT<mac><len><json>] 帧、ha/get 设备列表、device_control 查询/设置的应答和属性上报、
+系统心跳、场景触发和群组控制。用于在没有网关的情况下运行 AcClient / AcGateway，
+以及性能和长时间运行测试。
+
+可以生成合成设备，按指定速率产生上报风暴，并注入应答延迟、丢弃应答和断线。
+协议的长度字段只有 4 位十六进制，ha/get 的设备列表必须在 64 KB 以内（约 400 个合成设备）；
+上报风暴和命令不受此限制。
+
+命令行用法（在仓库根目录）:
+
+    python tools/simulator.py --devices 300 --latency 0.02 --storm 500
+
+在代码中使用:
+
+    simulator = AcGatewaySimulator(synthetic_topology(300), latency=0.01)
+    port = await simulator.start()
+    gateway = AcGateway(f"127.0.0.1:{port}", "aa:bb:cc:dd:ee:ff", "112233445566")
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections.abc import Callable
+import contextlib
+import logging
+from pathlib import Path
+import random
+import sys
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "custom_components/actec"))
+
+from core.client import LOGIN_PROMPT
+from core.frame import AcFrameDecoder, encode_frame, frame_prefix, json_dumps
+from core.types import FloorInfo, GroupType
+
+_LOGGER = logging.getLogger(__name__)
+
+PASSWORD = b"ACTEC123"
+SIMULATOR_MAC = "aabbccddeeff"
+DEVICES_PER_ROOM = 20
+MAX_CONTENT_LENGTH = 0xFFFF  # 帧头中的长度只有 4 位十六进制
+
+# 查询从未设置过的属性时返回的初始值
+DEFAULT_PROPERTIES = {
+    "onoff": {"onoff": 0},
+    "level": {"level": 0},
+    "cw": {"cw": 0},
+    "hsv": {"h": 0, "s": 0, "v": 0},
+    "position": {"position": 0},
+    "sensor": {"lightIntensity": 0},
+    "energy": {"power": 0},
+    "total_energy": {"total_energy": 0},
+}
+
+# 合成设备的产品型号 => 可控制的端点和 action
+PRODUCT_ENDPOINTS = {
+    "16": ((2, "onoff"),),
+    "17": ((2, "onoff"), (3, "onoff")),
+    "20": ((2, "level"),),
+    "4352": ((1, "onoff"), (1, "energy")),
+    "4608": ((1, "position"),),
+}
+
+Member = tuple[str, int]  # (device_id, endpoint)
+CommandHook = Callable[[dict, dict], bool | None]
+
+
+def synthetic_topology(
+    devices: int,
+    product_key: str = "20",
+    devices_per_room: int = DEVICES_PER_ROOM,
+) -> list[FloorInfo]:
+    """生成 integrated_list：每个房间 devices_per_room 个设备、一个场景和一个包含全部设备的群组."""
+    rooms = []
+    for room_index, start in enumerate(range(0, devices, devices_per_room)):
+        rooms.append(
+            {
+                "name": f"房间{room_index + 1}",
+                "devices": [
+                    {
+                        "name": f"设备{index + 1}",
+                        "device_id": f"sim{index:06d}",
+                        "product_key": product_key,
+                        "product_mode": None,
+                        "product_channel": None,
+                        "product_key_type": None,
+                    }
+                    for index in range(start, min(start + devices_per_room, devices))
+                ],
+                "scenes": [{"name": "全开", "scene_id": room_index + 1}],
+                "groups": [
+                    {
+                        "name": f"房间{room_index + 1}全部",
+                        "group_id": room_index + 1,
+                        "group_type": int(
+                            GroupType.BRIGHTNESS
+                            if product_key == "20"
+                            else GroupType.ON_OFF
+                        ),
+                    }
+                ],
+            }
+        )
+    return [{"floor_name": "1层", "rooms": rooms}]
+
+
+def synthetic_groups(integrated_list: list[FloorInfo]) -> dict[int, list[Member]]:
+    """synthetic_topology 中每个群组的成员：所在房间的全部设备端点."""
+    groups: dict[int, list[Member]] = {}
+    for floor in integrated_list:
+        for room in floor["rooms"]:
+            members = [
+                (device["device_id"], endpoint)
+                for device in room["devices"]
+                for endpoint, _ in PRODUCT_ENDPOINTS.get(device["product_key"], ())
+            ]
+            for group in room["groups"]:
+                groups[group["group_id"]] = members
+    return groups
+
+
+class _Session(asyncio.Protocol):
+    """一个客户端连接."""
+
+    def __init__(self, simulator: AcGatewaySimulator) -> None:
+        self._simulator = simulator
+        self._transport: asyncio.Transport | None = None
+        self._decoder = AcFrameDecoder()
+        self._login = bytearray()
+        self.authenticated = False
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self._transport = transport
+        self._simulator.sessions.add(self)
+        transport.write(LOGIN_PROMPT)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._simulator.sessions.discard(self)
+
+    def data_received(self, data: bytes) -> None:
+        if not self.authenticated:
+            self._login += data
+            if b"\r\n" not in self._login:
+                return
+            password, _, data = bytes(self._login).partition(b"\r\n")
+            if password != self._simulator.password:
+                self.abort()
+                return
+            self.authenticated = True
+        try:
+            frames = self._decoder.feed(data)
+        except ConnectionError:
+            self._simulator.parse_errors += 1
+            self.abort()
+            return
+        for frame in frames:
+            self._simulator.handle_frame(self, frame)
+
+    def send(self, frames: list[list[dict]]) -> None:
+        if self._transport is None or self._transport.is_closing():
+            return
+        prefix = self._simulator.prefix
+        self._transport.writelines([encode_frame(prefix, frame) for frame in frames])
+        self._simulator.frames_out += len(frames)
+
+    def abort(self) -> None:
+        if self._transport is not None:
+            self._transport.abort()
+
+
+class AcGatewaySimulator:
+    """模拟网关.
+
+    latency: 每个应答的延迟秒数（不阻塞同一连接上后续命令的处理）
+    drop_ack_rate: 丢弃 set/get/trigger 应答的概率，属性上报照常发送
+    disconnect_after: 收到这么多帧后断开所有连接（只触发一次），None 表示不断开
+    on_command: 在默认处理前调用 (head, body)，返回 True 表示已处理、跳过默认应答
+    """
+
+    def __init__(
+        self,
+        integrated_list: list[FloorInfo] | None = None,
+        *,
+        groups: dict[int, list[Member]] | None = None,
+        mac: str = SIMULATOR_MAC,
+        password: bytes = PASSWORD,
+        authorized: bool = True,
+        latency: float = 0.0,
+        drop_ack_rate: float = 0.0,
+        disconnect_after: int | None = None,
+        on_command: CommandHook | None = None,
+        seed: int | None = None,
+    ) -> None:
+        self.integrated_list = (
+            integrated_list if integrated_list is not None else synthetic_topology(10)
+        )
+        self.groups = (
+            groups if groups is not None else synthetic_groups(self.integrated_list)
+        )
+        self.prefix = frame_prefix(mac)
+        self.password = password
+        self.authorized = authorized
+        self.latency = latency
+        self.drop_ack_rate = drop_ack_rate
+        self.disconnect_after = disconnect_after
+        self.on_command = on_command
+        self.random = random.Random(seed)
+        # (device_id, endpoint, action) => property
+        self.state: dict[tuple[str, int, str], dict] = {}
+        self.sessions: set[_Session] = set()
+        self.frames_in = 0
+        self.frames_out = 0
+        self.parse_errors = 0
+        self.dropped_acks = 0
+        # (namespace, command) => 收到的次数
+        self.commands: dict[tuple[str, str], int] = {}
+        self._server: asyncio.Server | None = None
+
+    @property
+    def device_ids(self) -> list[str]:
+        return [
+            device["device_id"]
+            for floor in self.integrated_list
+            for room in floor["rooms"]
+            for device in room["devices"]
+        ]
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """开始监听，返回实际端口."""
+        loop = asyncio.get_running_loop()
+        self._server = await loop.create_server(lambda: _Session(self), host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        self.disconnect_all()
+        if server := self._server:
+            self._server = None
+            server.close()
+            await server.wait_closed()
+
+    def disconnect_all(self) -> None:
+        """断开所有客户端连接（模拟网关重启或网络中断）."""
+        for session in list(self.sessions):
+            session.abort()
+
+    # 命令处理
+
+    def handle_frame(self, session: _Session, frame: list[dict] | dict) -> None:
+        self.frames_in += 1
+        if (
+            self.disconnect_after is not None
+            and self.frames_in >= self.disconnect_after
+        ):
+            self.disconnect_after = None
+            self.disconnect_all()
+            return
+        if not isinstance(frame, list) or not frame:
+            return
+        head = frame[0]
+        body = frame[1] if len(frame) > 1 else {}
+        namespace = head.get("namespace")
+        command = head.get("command")
+        key = (namespace, command)
+        self.commands[key] = self.commands.get(key, 0) + 1
+        if self.on_command is not None and self.on_command(head, body):
+            return
+        if handler := self._handlers.get(key):
+            self._reply(session, handler(self, body))
+
+    def _reply(self, session: _Session, frames: list[list[dict]]) -> None:
+        # 第一帧是应答，后面的是属性上报
+        if frames and self.drop_ack_rate and self.random.random() < self.drop_ack_rate:
+            self.dropped_acks += 1
+            frames = frames[1:]
+        if not frames:
+            return
+        if self.latency:
+            asyncio.get_running_loop().call_later(self.latency, session.send, frames)
+        else:
+            session.send(frames)
+
+    def _ha_get(self, body: dict) -> list[list[dict]]:
+        head = {"namespace": "ha", "response": "get", "type": "report"}
+        if not self.authorized:
+            return [[{**head, "success": False}, {}]]
+        frame = [{**head, "success": True}, {"integrated_list": self.integrated_list}]
+        if len(json_dumps(frame)) > MAX_CONTENT_LENGTH:
+            # 真实网关同样无法在一帧中发送，不发送错误的帧
+            _LOGGER.error(
+                "设备列表超过单帧上限 %s 字节，请减少设备数量", MAX_CONTENT_LENGTH
+            )
+            return []
+        return [frame]
+
+    def _ping(self, body: dict) -> list[list[dict]]:
+        return [[{"namespace": "system", "response": "ping", "success": True}, {}]]
+
+    def _device_get(self, body: dict) -> list[list[dict]]:
+        key = (body.get("device_id"), body.get("endpoint"), body.get("action"))
+        prop = self.state.get(key) or DEFAULT_PROPERTIES.get(key[2], {key[2]: 0})
+        head = {
+            "namespace": "device_control",
+            "response": "get",
+            "type": "device_property",
+            "success": True,
+        }
+        return [[head, {**body, "property": prop}]]
+
+    def _device_set(self, body: dict) -> list[list[dict]]:
+        device_id = body.get("device_id")
+        endpoint = body.get("endpoint")
+        action = body.get("action")
+        prop = body.get("property", {})
+        self.state[(device_id, endpoint, action)] = prop
+        ack = {"device_id": device_id, "endpoint": endpoint, "action": action}
+        return [
+            [
+                {"namespace": "device_control", "response": "set", "success": True},
+                ack,
+            ],
+            self.property_report(device_id, endpoint, action, prop),
+        ]
+
+    def _scene_trigger(self, body: dict) -> list[list[dict]]:
+        head = {"namespace": "scene_control", "response": "trigger", "success": True}
+        return [[head, body]]
+
+    def _group_set(self, body: dict) -> list[list[dict]]:
+        action = body.get("action")
+        prop = body.get("property", {})
+        frames = [
+            [
+                {"namespace": "group_control", "response": "set", "success": True},
+                body,
+            ]
+        ]
+        for device_id, endpoint in self.groups.get(body.get("group_id"), ()):
+            self.state[(device_id, endpoint, action)] = prop
+            frames.append(self.property_report(device_id, endpoint, action, prop))
+        return frames
+
+    _handlers: dict[tuple[str, str], Callable[..., list[list[dict]]]] = {
+        ("ha", "get"): _ha_get,
+        ("system", "ping"): _ping,
+        ("device_control", "get"): _device_get,
+        ("device_control", "set"): _device_set,
+        ("scene_control", "trigger"): _scene_trigger,
+        ("group_control", "set"): _group_set,
+    }
+
+    # 主动上报
+
+    @staticmethod
+    def property_report(
+        device_id: str, endpoint: int, action: str, prop: dict
+    ) -> list[dict]:
+        return [
+            {"namespace": "device_control", "type": "device_property"},
+            {
+                "device_id": device_id,
+                "endpoint": endpoint,
+                "action": action,
+                "property": prop,
+            },
+        ]
+
+    def broadcast(self, frames: list[list[dict]]) -> None:
+        """向所有已登录的连接发送帧."""
+        for session in self.sessions:
+            if session.authenticated:
+                session.send(frames)
+
+    async def report_storm(
+        self,
+        count: int,
+        rate: float,
+        action: str = "level",
+        endpoint: int = 2,
+        batch: int = 10,
+    ) -> None:
+        """以每秒 rate 条的速率，随机设备随机值发送 count 条属性上报，每次写入 batch 条."""
+        device_ids = self.device_ids
+        interval = batch / rate
+        sent = 0
+        while sent < count:
+            frames = []
+            for _ in range(min(batch, count - sent)):
+                device_id = self.random.choice(device_ids)
+                prop = {action: self.random.randrange(256)}
+                self.state[(device_id, endpoint, action)] = prop
+                frames.append(self.property_report(device_id, endpoint, action, prop))
+            self.broadcast(frames)
+            sent += len(frames)
+            await asyncio.sleep(interval)
+
+    def stats(self) -> dict:
+        return {
+            "sessions": len(self.sessions),
+            "frames_in": self.frames_in,
+            "frames_out": self.frames_out,
+            "parse_errors": self.parse_errors,
+            "dropped_acks": self.dropped_acks,
+            "commands": {f"{ns}/{cmd}": n for (ns, cmd), n in self.commands.items()},
+        }
+
+
+async def _main(args: argparse.Namespace) -> None:
+    simulator = AcGatewaySimulator(
+        synthetic_topology(args.devices, args.product_key),
+        latency=args.latency,
+        drop_ack_rate=args.drop_acks,
+        authorized=not args.unauthorized,
+        seed=args.seed,
+    )
+    endpoint, action = PRODUCT_ENDPOINTS[args.product_key][0]
+    port = await simulator.start(args.host, args.port)
+    _LOGGER.info("模拟网关已启动 %s:%s，%s 个设备", args.host, port, args.devices)
+    try:
+        while True:
+            if args.storm and simulator.sessions:
+                await simulator.report_storm(args.storm, args.storm, action, endpoint)
+            else:
+                await asyncio.sleep(1)
+            _LOGGER.info("%s", simulator.stats())
+    finally:
+        await simulator.stop()
+
+
+def main() -> None:
+    """Run the simulator until interrupted."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument("--product-key", default="20", choices=PRODUCT_ENDPOINTS)
+    parser.add_argument("--latency", type=float, default=0.0, help="应答延迟（秒）")
+    parser.add_argument("--drop-acks", type=float, default=0.0, help="丢弃应答的概率")
+    parser.add_argument("--storm", type=int, default=0, help="每秒属性上报条数")
+    parser.add_argument("--unauthorized", action="store_true", help="ha/get 返回未授权")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()